@@ -9,9 +9,18 @@ import sys
 import subprocess
 import platform
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.machinery import PathFinder
 from pathlib import Path
 from typing import List, Optional
 
+CURRENT_PLATFORM = platform.system().lower()
+DOCKER_IMAGE_NAME = "filedupfinder:latest"
+# Registry-qualified image to reuse layers from (e.g. ghcr.io/user/filedupfinder:latest)
+DOCKER_CACHE_IMAGE_ENV = "DOCKER_CACHE_IMAGE"
+
 
 class Builder:
     def __init__(self):
@@ -20,22 +29,29 @@ class Builder:
         self.build_dir = self.project_root / "build"
         self.src_dir = self.project_root / "src"
         
-    def run_command(self, cmd: List[str], cwd: Optional[Path] = None) -> bool:
-        """Run a command and return success status."""
+    def run_command(self, cmd: List[str], cwd: Optional[Path] = None, capture: bool = False) -> bool:
+        """
+        Run a command and return success status.
+
+        Output streams straight to the terminal unless ``capture`` is set, in
+        which case it is buffered and printed once the command exits.
+        """
         try:
             print(f"Running: {' '.join(cmd)}")
             result = subprocess.run(
                 cmd, 
                 cwd=cwd or self.project_root,
                 check=True,
-                capture_output=True,
+                capture_output=capture,
                 text=True
             )
-            print(result.stdout)
+            if capture:
+                print(result.stdout)
             return True
         except subprocess.CalledProcessError as e:
             print(f"Error running command: {' '.join(cmd)}")
-            print(f"Error: {e.stderr}")
+            if capture:
+                print(f"Error: {e.stderr}")
             return False
 
     def run_command_with_env(self, cmd: List[str], cwd: Optional[Path] = None, env: Optional[dict] = None, capture_output: bool = False) -> bool:
@@ -60,12 +76,26 @@ class Builder:
             return False
 
     def clean_build_dirs(self):
-        """Clean build and dist directories."""
+        """
+        Clean build and dist directories.
+
+        Each directory is renamed aside and recreated empty straight away; the
+        old tree is deleted in a background thread so the next build step does
+        not wait for thousands of unlink calls. The thread is not a daemon, so
+        the interpreter finishes the deletion before exiting.
+        """
         print("Cleaning build directories...")
         for dir_path in [self.dist_dir, self.build_dir]:
+            stale = sorted(dir_path.parent.glob(f"{dir_path.name}.old-*"))
             if dir_path.exists():
-                shutil.rmtree(dir_path)
+                old_path = dir_path.with_name(f"{dir_path.name}.old-{os.getpid()}-{time.time_ns()}")
+                os.replace(dir_path, old_path)
+                stale.append(old_path)
+                dir_path.mkdir()
                 print(f"Removed {dir_path}")
+            # Also pick up trees left behind by an interrupted earlier clean
+            for path in stale:
+                threading.Thread(target=shutil.rmtree, args=(path,), kwargs={"ignore_errors": True}).start()
 
     def build_pypi_package(self):
         """Build PyPI package (wheel and source distribution)."""
@@ -123,14 +153,12 @@ class Builder:
             str(self.src_dir / "filedupfinder" / "__main__.py")
         ]
         
-        if not self.run_command(cli_spec):
-            print("Failed to build CLI executable")
-            return False
+        builds = {"CLI": cli_spec}
 
         # Build GUI executable (if PySide6 is available)
         try:
             import PySide6
-            gui_spec = [
+            builds["GUI"] = [
                 "pyinstaller",
                 "--onefile",
                 "--windowed",
@@ -141,14 +169,19 @@ class Builder:
                 "--add-data", f"{self.project_root}/assets/fdf-icon.ico{os.pathsep}assets/",
                 str(self.src_dir / "gui" / "gui_app.py")
             ]
-            
-            if not self.run_command(gui_spec):
-                print("Failed to build GUI executable")
-                return False
-                
         except ImportError:
             print("PySide6 not available, skipping GUI executable")
 
+        # The builds use separate work/spec paths, so they can run side by side
+        with ThreadPoolExecutor(max_workers=len(builds)) as executor:
+            futures = {name: executor.submit(self.run_command, spec) for name, spec in builds.items()}
+            failed = [name for name, future in futures.items() if not future.result()]
+
+        if failed:
+            for name in failed:
+                print(f"Failed to build {name} executable")
+            return False
+
         print(f"Standalone executables built for {platform_name}!")
         return True
 
@@ -162,9 +195,25 @@ class Builder:
             print("Creating Dockerfile...")
             self.create_dockerfile()
         
-        # Build Docker image
-        image_name = "filedupfinder:latest"
-        if not self.run_command(["docker", "build", "-t", image_name, "."]):
+        # Reuse layers from a published image only when one is configured; the
+        # local tag alone would make docker look it up on Docker Hub, where it does not exist
+        cache_image = os.environ.get(DOCKER_CACHE_IMAGE_ENV)
+        cache_args: List[str] = []
+        if cache_image:
+            if self.run_command(["docker", "pull", cache_image]):
+                cache_args = ["--cache-from", cache_image]
+            else:
+                print(f"Cache image {cache_image} not available, building from scratch")
+
+        env = os.environ.copy()
+        env['DOCKER_BUILDKIT'] = '1'
+        build_cmd = [
+            "docker", "build",
+            *cache_args,
+            "--build-arg", "BUILDKIT_INLINE_CACHE=1",  # Embed cache metadata for the next build
+            "-t", DOCKER_IMAGE_NAME, "."
+        ]
+        if not self.run_command_with_env(build_cmd, env=env):
             print("Failed to build Docker image")
             return False
             
@@ -319,30 +368,38 @@ echo "Run 'filedupfinder-gui' to start the GUI"
         
         print("Install scripts created in scripts/ directory!")
 
-    def test_package(self):
-        """Test package configuration without building."""
+    def test_package(self, deep: bool = False):
+        """
+        Test package configuration without building.
+
+        Modules are located with ``importlib.machinery.PathFinder`` rather than
+        imported, so no package code (or Qt) is initialised. With ``deep`` the
+        CLI entry point is imported as well.
+        """
         print("\n=== Testing Package Configuration ===")
         
-        # Test if we can import the package
-        try:
-            sys.path.insert(0, str(self.src_dir))
-            import filedupfinder
-            print("✅ Package imports successfully")
-            
-            # Test CLI entry point
-            from filedupfinder.__main__ import main
-            print("✅ CLI entry point works")
-            
-            # Test GUI entry point (if available)
-            try:
-                from gui.gui_app import main as gui_main
-                print("✅ GUI entry point works")
-            except ImportError:
-                print("⚠️  GUI entry point not available (PySide6 not installed)")
-                
-        except ImportError as e:
-            print(f"❌ Package import failed: {e}")
+        src_path = [str(self.src_dir)]
+        if PathFinder.find_spec("duplicatemaster", src_path) is None:
+            print("❌ Package not found: duplicatemaster")
             return False
+        print("✅ Package found")
+
+        # Test CLI entry point
+        if deep:
+            try:
+                sys.path.insert(0, str(self.src_dir))
+                from duplicatemaster.__main__ import main
+                print("✅ CLI entry point works")
+            except ImportError as e:
+                print(f"❌ Package import failed: {e}")
+                return False
+
+        # Test GUI entry point (if available)
+        gui_spec = PathFinder.find_spec("gui", src_path)
+        if gui_spec and PathFinder.find_spec("gui_app", gui_spec.submodule_search_locations):
+            print("✅ GUI entry point found")
+        else:
+            print("⚠️  GUI entry point not found")
             
         # Test pyproject.toml syntax
         try:
@@ -366,8 +423,7 @@ echo "Run 'filedupfinder-gui' to start the GUI"
             return False
         
         # Build standalone executables for current platform
-        current_platform = platform.system().lower()
-        if not self.build_standalone_executable(current_platform):
+        if not self.build_standalone_executable(CURRENT_PLATFORM):
             return False
         
         # Create Docker files
@@ -378,7 +434,7 @@ echo "Run 'filedupfinder-gui' to start the GUI"
         
         print("\n=== Build Complete! ===")
         print(f"PyPI package: {self.dist_dir}")
-        print(f"Standalone executable: {self.dist_dir}/standalone-{current_platform}")
+        print(f"Standalone executable: {self.dist_dir}/standalone-{CURRENT_PLATFORM}")
         print("Docker files created")
         print("Install scripts created in scripts/")
         return True
@@ -392,11 +448,11 @@ def main():
         command = sys.argv[1].lower()
         
         if command == "test":
-            success = builder.test_package()
+            success = builder.test_package(deep="--deep" in sys.argv[2:])
         elif command == "pypi":
             success = builder.build_pypi_package()
         elif command == "standalone":
-            platform_name = sys.argv[2] if len(sys.argv) > 2 else platform.system().lower()
+            platform_name = sys.argv[2] if len(sys.argv) > 2 else CURRENT_PLATFORM
             success = builder.build_standalone_executable(platform_name)
         elif command == "docker":
             success = builder.build_docker_image()
@@ -405,10 +461,10 @@ def main():
             success = True
         else:
             print("Usage: python build.py [test|pypi|standalone|docker|clean|all]")
-            print("  test      - Test package configuration (lightweight)")
+            print("  test      - Test package configuration (lightweight; --deep also imports the CLI)")
             print("  pypi      - Build PyPI package")
             print("  standalone - Build standalone executable")
-            print("  docker    - Build Docker image")
+            print(f"  docker    - Build Docker image (set {DOCKER_CACHE_IMAGE_ENV} to a registry image to reuse its layers)")
             print("  clean     - Clean build directories")
             print("  all       - Build everything (default)")
             return
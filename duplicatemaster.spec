@@ -9,6 +9,7 @@ a = Analysis(
     datas=[('assets/fdf-icon.ico', 'assets')],
     hiddenimports=[
         'duplicatemaster.hasher',
+        'duplicatemaster.hashcache',
         'duplicatemaster.deduper',
         'duplicatemaster.analyzer',
         'duplicatemaster.deletion',
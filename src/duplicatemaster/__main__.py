@@ -1,12 +1,15 @@
 from .cli import parse_args
 from .logger import setup_logger
 from .deduper import find_duplicates
+from .hasher import HASH_ALGORITHMS, AUTO_HASH_ALGORITHM, is_hash_algorithm_available
 from .analyzer import analyze_space_savings, format_bytes
 from .deletion import handle_deletion
 from .exporter import export_results
 from .demo import run_demo
 from .benchmark import run_benchmark
 import os
+import logging
+import multiprocessing
 from typing import Dict, List, Tuple, Any
 
 
@@ -21,16 +24,24 @@ def display_detailed_results(duplicates: Dict[Tuple[int, str], List[str]], logge
     if not duplicates:
         logger.info("   • No duplicate files found in the scanned directory.")
         return
-    
+
+    # Skip sorting and formatting every group when INFO output is suppressed
+    is_enabled = getattr(logger, "isEnabledFor", None)
+    if is_enabled is not None and not is_enabled(logging.INFO):
+        return
+
     logger.info("\n📋 Duplicate Groups Found:")
     logger.info("-" * 50)
-    
-    for i, ((size, hash_val), paths) in enumerate(duplicates.items(), 1):
-        logger.info(f"\n🔍 Group {i} (Size: {format_bytes(size)}, Hash: {hash_val[:8]}...)")
+
+    # Scanned paths are normally absolute already; look up the working
+    # directory once instead of once per relative path
+    cwd = os.getcwd()
+    for i, ((size, hash_val), paths) in enumerate(sorted(duplicates.items()), 1):
+        logger.info("\n🔍 Group %d (Size: %s, Hash: %s...)", i, format_bytes(size), hash_val[:8])
         for j, path in enumerate(paths):
             # Show absolute path for complete file location
-            abs_path = os.path.abspath(path)
-            logger.info(f"  [{j}] {abs_path}")
+            abs_path = path if os.path.isabs(path) else os.path.normpath(os.path.join(cwd, path))
+            logger.info("  [%d] %s", j, abs_path)
 
 
 def main() -> None:
@@ -90,6 +101,11 @@ def main() -> None:
         logger.error(f"Invalid directory: {args.basedir}")
         return
 
+    if args.hash != AUTO_HASH_ALGORITHM and not is_hash_algorithm_available(args.hash):
+        logger.error(f"Hash algorithm '{args.hash}' requires the '{HASH_ALGORITHMS[args.hash]}' "
+                     f"package (pip install duplicatemaster[fast])")
+        return
+
     duplicates = find_duplicates(
         base_dir=os.path.abspath(args.basedir),
         min_size=args.minsize,
@@ -101,7 +117,11 @@ def main() -> None:
         exclude_hidden=args.exclude_hidden,
         threads=args.threads,
         logger=logger,
-        use_optimized_scanning=not args.legacy_scan
+        use_optimized_scanning=not args.legacy_scan,
+        prefix_size=args.bufsize,
+        hash_algorithm=args.hash,
+        hash_cache=args.hash_cache,
+        hash_parallelism=args.hash_parallelism
     )
 
     total_space, savings = analyze_space_savings(duplicates)
@@ -126,4 +146,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Required for the hashing process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
@@ -1,6 +1,11 @@
+from functools import lru_cache
+from operator import itemgetter, mul
 from typing import Dict, List, Tuple
 
 
+BYTE_UNITS = ('bytes', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def analyze_space_savings(duplicates: Dict[Tuple[int, str], List[str]]) -> Tuple[int, int]:
     """
     Analyze the disk space usage and potential savings from duplicate files.
@@ -24,19 +29,22 @@ def analyze_space_savings(duplicates: Dict[Tuple[int, str], List[str]]) -> Tuple
         >>> print(f"Total: {total}, Savings: {savings}")
         Total: 2048, Savings: 1024
     """
-    total = savings = 0
-    for (size, _), paths in duplicates.items():
-        total += size * len(paths)
-        savings += size * (len(paths) - 1)
-    return total, savings
+    # Keeping one copy per group reclaims everything but the sum of group
+    # sizes; map() keeps both sums out of the bytecode loop
+    sizes = list(map(itemgetter(0), duplicates))
+    total = sum(map(mul, sizes, map(len, duplicates.values())))
+    return total, total - sum(sizes)
 
 
+@lru_cache(maxsize=4096)
 def format_bytes(size: float) -> str:
     """
     Convert a file size in bytes to a human-readable string.
 
     This function converts byte values to the most appropriate unit (bytes, KB, MB, GB, TB)
-    and formats the result with one decimal place.
+    and formats the result with one decimal place. The unit is picked from
+    the bit length of the size, so only one division is done, and results
+    are cached because duplicate groups often share sizes.
 
     Args:
         size: File size in bytes.
@@ -52,8 +60,7 @@ def format_bytes(size: float) -> str:
         >>> format_bytes(1073741824)
         '1.0 GB'
     """
-    for unit in ['bytes', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024:
-            return f"{size:.1f} {unit}"
-        size /= 1024
-    return f"{size:.1f} PB"
+    if size < 1024:
+        return f"{size:.1f} bytes"
+    unit = min(len(BYTE_UNITS) - 1, (int(size).bit_length() - 1) // 10)
+    return f"{size / (1 << (10 * unit)):.1f} {BYTE_UNITS[unit]}"
@@ -1,6 +1,68 @@
 import argparse
+from functools import lru_cache
 from typing import Any
-from .hasher import DEFAULT_THREADS
+from .hasher import DEFAULT_THREADS, PREFIX_BUFSIZE, HASH_ALGORITHMS, AUTO_HASH_ALGORITHM, HASH_PARALLELISM
+from .hashcache import DEFAULT_CACHE_PATH
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for byte counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number of bytes, got {number}")
+    return number
+
+
+@lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once per process; parsing never modifies it."""
+    parser = argparse.ArgumentParser(
+        description="DuplicateMaster - High-performance parallel duplicate file finder")
+    parser.add_argument('basedir', nargs='?', default=".",
+                        help='Directory to scan')
+    parser.add_argument('--minsize', type=int, default=4,
+                        help='Minimum file size in MB (default: 4 MB)')
+    parser.add_argument('--maxsize', type=int, default=4096,
+                        help='Maximum file size in MB (default: 4096 MB = 4 GB)')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--multi-region', action='store_true')
+    parser.add_argument('--bufsize', type=_positive_int, default=PREFIX_BUFSIZE,
+                        help=f'Bytes hashed per file in quick mode (default: {PREFIX_BUFSIZE})')
+    parser.add_argument('--hash', default=AUTO_HASH_ALGORITHM,
+                        choices=[AUTO_HASH_ALGORITHM] + list(HASH_ALGORITHMS),
+                        help='Content hash algorithm; blake3 and xxh3 need the optional '
+                             'packages. auto uses blake2b for prefixes and blake3, when '
+                             f'installed, for full files (default: {AUTO_HASH_ALGORITHM})')
+    parser.add_argument('--hash-cache', nargs='?', const=DEFAULT_CACHE_PATH, default=None,
+                        metavar='PATH',
+                        help='Remember digests of unchanged files between scans in a SQLite '
+                             f'database (default location: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS)
+    parser.add_argument('--hash-parallelism', default="auto", choices=HASH_PARALLELISM,
+                        help='Hash large batches in a process pool (auto), or always use '
+                             'threads or processes (default: auto)')
+    parser.add_argument('--loglevel', default="info",
+                        choices=["debug", "info", "warning", "error"])
+    parser.add_argument('--logfile', type=str)
+    parser.add_argument('--json-out', type=str)
+    parser.add_argument('--csv-out', type=str)
+    parser.add_argument('--delete', action='store_true')
+    parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--force', action='store_true')
+    parser.add_argument('--interactive', action='store_true')
+    parser.add_argument('--exclude', action='append', default=[])
+    parser.add_argument('--exclude-dir', action='append', default=[])
+    parser.add_argument('--exclude-hidden', action='store_true')
+    parser.add_argument('--demo', action='store_true', 
+                        help='Run demo mode with test files (creates temporary files, scans, shows results, cleans up)')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Run performance benchmark comparing optimized vs legacy scanning')
+    parser.add_argument('--legacy-scan', action='store_true',
+                        help='Use legacy scanning method (disable optimizations)')
+    return parser
 
 
 def parse_args() -> Any:
@@ -18,7 +80,11 @@ def parse_args() -> Any:
             - maxsize: Maximum file size in MB (default: 4096 MB = 4 GB)
             - quick: Enable quick scan mode (default: False)
             - multi_region: Enable multi-region scan mode (default: False)
+            - bufsize: Bytes hashed per file in quick mode (default: 64 KB)
+            - hash: Content hash algorithm (default: auto)
+            - hash_cache: Hash cache database path, or None when caching is off (default: None)
             - threads: Number of hashing threads (default: auto-detect)
+            - hash_parallelism: Thread or process pools for batch hashing (default: auto)
             - loglevel: Logging level (default: info)
             - logfile: Path to log file (default: None)
             - json_out: Path for JSON export (default: None)
@@ -46,37 +112,7 @@ def parse_args() -> Any:
         - The function handles both required and optional arguments
         - Default values are optimized for typical usage scenarios
     """
-    parser = argparse.ArgumentParser(
-        description="DuplicateMaster - High-performance parallel duplicate file finder")
-    parser.add_argument('basedir', nargs='?', default=".",
-                        help='Directory to scan')
-    parser.add_argument('--minsize', type=int, default=4,
-                        help='Minimum file size in MB (default: 4 MB)')
-    parser.add_argument('--maxsize', type=int, default=4096,
-                        help='Maximum file size in MB (default: 4096 MB = 4 GB)')
-    parser.add_argument('--quick', action='store_true')
-    parser.add_argument('--multi-region', action='store_true')
-    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS)
-    parser.add_argument('--loglevel', default="info",
-                        choices=["debug", "info", "warning", "error"])
-    parser.add_argument('--logfile', type=str)
-    parser.add_argument('--json-out', type=str)
-    parser.add_argument('--csv-out', type=str)
-    parser.add_argument('--delete', action='store_true')
-    parser.add_argument('--dry-run', action='store_true')
-    parser.add_argument('--force', action='store_true')
-    parser.add_argument('--interactive', action='store_true')
-    parser.add_argument('--exclude', action='append', default=[])
-    parser.add_argument('--exclude-dir', action='append', default=[])
-    parser.add_argument('--exclude-hidden', action='store_true')
-    parser.add_argument('--demo', action='store_true', 
-                        help='Run demo mode with test files (creates temporary files, scans, shows results, cleans up)')
-    parser.add_argument('--benchmark', action='store_true',
-                        help='Run performance benchmark comparing optimized vs legacy scanning')
-    parser.add_argument('--legacy-scan', action='store_true',
-                        help='Use legacy scanning method (disable optimizations)')
-    
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
     
     # Convert MB to bytes for backward compatibility
     args.minsize = args.minsize * 1024 * 1024
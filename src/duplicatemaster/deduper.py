@@ -1,8 +1,105 @@
 import os
+import sqlite3
 from collections import defaultdict
-from typing import Optional, Callable, Dict, Any, List, Tuple
+from typing import Optional, Callable, Dict, Any, Iterable, List, Tuple
 from .scanner import get_files_recursively, get_files_with_size_filter
-from .hasher import batch_hash_files, hash_files_with_size_info
+from .hashcache import HashCache
+from .hasher import (
+    batch_hash_files, batch_compare_files, hash_files_pipelined, is_rotational, covers_whole_file,
+    resolve_hash_algorithms, PREFIX_BUFSIZE, AUTO_HASH_ALGORITHM, ROTATIONAL_MAX_THREADS,
+    REGION_SCREEN_MIN_SIZE
+)
+
+
+def _group_by_size(
+    files_with_size: Iterable[Tuple[int, str]],
+    scan_callback: Callable[[int], None]
+) -> Dict[int, List[str]]:
+    """
+    Group files by size, keeping only sizes shared by two or more files.
+
+    A file whose size is unique cannot have a duplicate. Such files are held as
+    a bare path while scanning, so no list is allocated for the (usually
+    large) majority of sizes that occur once.
+    """
+    first_seen: Dict[int, str] = {}
+    groups: Dict[int, List[str]] = {}
+    count = 0
+    for size, path in files_with_size:
+        count += 1
+        group = groups.get(size)
+        if group is not None:
+            group.append(path)
+        elif size in first_seen:
+            groups[size] = [first_seen.pop(size), path]
+        else:
+            first_seen[size] = path
+    scan_callback(count)
+    return groups
+
+
+def _merge_hardlinks(
+    duplicates: Dict[Tuple[int, str], List[str]],
+    hardlinks: Dict[str, List[str]],
+    extra_keys: Dict[str, Tuple[int, str]]
+) -> Dict[Tuple[int, str], List[str]]:
+    """
+    Add hard-link aliases back into the duplicate groups.
+
+    Args:
+        duplicates: Groups found among the paths that were actually hashed.
+        hardlinks: First path of each multiply-linked inode mapped to its other links.
+        extra_keys: (size, hash) keys for first paths that are in no group,
+                    so their links form a group of their own.
+
+    Returns:
+        The groups with every alias listed next to the path it links to.
+    """
+    key_of = {path: key for key, paths in duplicates.items() for path in paths}
+    key_of.update(extra_keys)
+    merged = {key: list(paths) for key, paths in duplicates.items()}
+    for first, aliases in hardlinks.items():
+        key = key_of.get(first)
+        if key is not None:
+            merged.setdefault(key, [first]).extend(aliases)
+    return merged
+
+
+def _screen_regions(
+    groups: Dict[Tuple[int, Optional[str]], List[str]],
+    threads: int,
+    algorithm: str,
+    cache_path: Optional[str],
+    parallelism: str = "auto"
+) -> Dict[Tuple[int, Optional[str]], List[str]]:
+    """
+    Split prefix-matched groups of large files by a hash of their start, middle and end.
+
+    Files that share a header (media containers, archives, disk images) often
+    differ further in; a few 4KB reads per file separate them before any of
+    them is read in full. Groups that did not have a prefix pass, and files
+    below ``REGION_SCREEN_MIN_SIZE``, are returned unchanged.
+
+    Returns:
+        The groups re-keyed by (size, prefix hash + region hash), keeping only
+        those with two or more files.
+    """
+    sizes = {p: s for (s, h), paths in groups.items()
+             if h is not None and s >= REGION_SCREEN_MIN_SIZE for p in paths}
+    if not sizes:
+        return groups
+    region_hashes = batch_hash_files(list(sizes), 4096, True, threads, algorithm=algorithm,
+                                     file_sizes=sizes, cache_path=cache_path, parallelism=parallelism)
+    screened: Dict[Tuple[int, Optional[str]], List[str]] = defaultdict(list)
+    for (s, h), paths in groups.items():
+        if h is None or s < REGION_SCREEN_MIN_SIZE:
+            screened[(s, h)] = paths
+            continue
+        for path in paths:
+            region_hash = region_hashes.get(path)
+            if region_hash is not None:
+                screened[(s, h + region_hash)].append(path)
+    return {key: paths for key, paths in screened.items() if len(paths) > 1}
 
 
 def find_duplicates(
@@ -17,11 +114,28 @@ def find_duplicates(
     threads: int,
     logger: Any,
     progress_callback: Optional[Callable[[int, str], None]] = None,
-    use_optimized_scanning: bool = True
+    use_optimized_scanning: bool = True,
+    prefix_size: int = PREFIX_BUFSIZE,
+    hash_algorithm: str = AUTO_HASH_ALGORITHM,
+    hash_cache: Optional[str] = None,
+    hash_parallelism: str = "auto"
 ) -> Dict[Tuple[int, str], List[str]]:
     """
     Find duplicate files in a directory with optimized performance.
 
+    Files are narrowed down in stages, each reading only what the previous
+    one could not rule out:
+
+    1. Size: files whose size is unique are never opened.
+    2. Prefix: files of a size shared by enough others have their first bytes
+       hashed (the whole file if it is small). In full mode a size shared by
+       exactly two files skips this stage.
+    3. Regions (full mode only): large files whose prefixes match have 4KB
+       from their start, middle and end hashed, unless ``multi_region``
+       already did so in stage 2.
+    4. Full content (full mode only): pairs are compared byte by byte and larger
+       groups are hashed whole, unless the prefix hash already read every byte.
+
     Args:
         base_dir: Base directory to scan.
         min_size: Minimum file size in bytes.
@@ -35,108 +149,234 @@ def find_duplicates(
         logger: Logger instance.
         progress_callback: Progress callback function.
         use_optimized_scanning: Use optimized scanning with early size filtering.
+        prefix_size: Number of leading bytes hashed per file in quick mode (at least 1).
+        hash_algorithm: Content hash algorithm ('auto', 'blake2b', 'blake3' or 'xxh3').
+                        With 'auto', quick mode reports BLAKE2b prefix hashes and
+                        full mode reports full-file hashes of the verification
+                        algorithm only.
+        hash_cache: Path of a SQLite database that remembers digests of unchanged
+                    files between scans (None to disable).
+        hash_parallelism: 'auto', 'threads' or 'processes'; how batch hashing
+                          passes are parallelised (see ``batch_hash_files``).
 
     Returns:
         Dictionary mapping (size, hash) tuples to lists of file paths.
+
+    Raises:
+        ValueError: If ``prefix_size`` is not a positive int; an empty prefix
+                    would make every file of a size look identical.
     """
+    if isinstance(prefix_size, bool) or not isinstance(prefix_size, int) or prefix_size <= 0:
+        raise ValueError(f"prefix_size must be a positive int, got {prefix_size!r}")
+
     if progress_callback:
         progress_callback(0, "Scanning for files...")
 
-    # Use optimized scanning with early size filtering
-    if use_optimized_scanning:
-        files_with_size = list(get_files_with_size_filter(
-            base_dir, exclude, exclude_dir, exclude_hidden, 
-            min_size, max_size, logger, max_workers=threads
-        ))
-        
-        if progress_callback:
-            progress_callback(15, f"Found {len(files_with_size)} files to process...")
-    else:
-        # Fallback to original scanning method
-        files = []
-        for path in get_files_recursively(base_dir, exclude, exclude_dir, exclude_hidden, logger, max_workers=threads):
-            try:
-                size = os.path.getsize(path)
-                if min_size < size < max_size:
-                    files.append((size, path))
-            except OSError:
-                continue
-        files_with_size = files
-        
-        if progress_callback:
-            progress_callback(15, f"Found {len(files_with_size)} files to process...")
+    prefix_algorithm, full_algorithm = resolve_hash_algorithms(hash_algorithm)
+    if not quick_mode:
+        # Full mode only reports full-file digests. Hashing the first pass with
+        # the same algorithm lets groups it already read whole keep their key,
+        # so one result never mixes digests of two algorithms
+        prefix_algorithm = full_algorithm
 
-    if not files_with_size:
-        if progress_callback:
-            progress_callback(100, "No files found matching criteria.")
-        return {}
+    if hash_cache is not None:
+        # Create the database up front so hashing workers only read and write rows
+        try:
+            HashCache(hash_cache).close()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Hash cache disabled, cannot open {hash_cache}: {e}")
+            hash_cache = None
+
+    # Many concurrent readers make a spinning disk seek between files
+    hash_threads = threads
+    if is_rotational(base_dir) and threads > ROTATIONAL_MAX_THREADS:
+        hash_threads = ROTATIONAL_MAX_THREADS
+        logger.debug(f"Rotational disk detected, hashing with {hash_threads} threads")
 
     def quick_scan_progress(p: int):
         if progress_callback:
             # Scale this phase to be 15% -> 65% of total
             progress_callback(15 + int(p * 0.5), f"Hashing... ({p}%)")
 
-    # Use optimized hashing with size information
+    scanned = 0
+    # Hard links share one inode, so only the first path seen for each inode
+    # is hashed; the others are added back to its group at the end
+    hardlinks: Dict[str, List[str]] = {}
+    # (device, inode) from the scanner's stat, so reads are ordered by inode
+    # without stat'ing each file again
+    inodes: Dict[str, Tuple[int, int]] = {}
+
+    def scan_complete(count: int):
+        nonlocal scanned
+        scanned = count
+        if progress_callback:
+            progress_callback(15, f"Found {count} files to process...")
+
+    # In full mode a pair of same-size files is compared byte by byte, which
+    # reads each file once; hashing their heads first would read those twice
+    min_group_size = 2 if quick_mode else 3
+
     if use_optimized_scanning:
-        hash_results = hash_files_with_size_info(
-            files_with_size,
-            4096 if quick_mode else "auto",
+        # Scan and first-pass hashing overlap: a size bucket is hashed as soon as
+        # it has enough members, while the scanner keeps walking the tree.
+        # A file whose size stays unique cannot have a duplicate and is never hashed.
+        groups, hash_results = hash_files_pipelined(
+            get_files_with_size_filter(
+                base_dir, exclude, exclude_dir, exclude_hidden,
+                min_size, max_size, logger, max_workers=threads, hardlinks=hardlinks,
+                with_inode=True
+            ),
+            prefix_size if quick_mode else "auto",
             multi_region and not quick_mode,
-            threads,
-            progress_callback=quick_scan_progress if progress_callback else None
+            hash_threads,
+            progress_callback=quick_scan_progress if progress_callback else None,
+            scan_callback=scan_complete,
+            algorithm=prefix_algorithm,
+            min_group_size=min_group_size,
+            cache_path=hash_cache,
+            inodes=inodes,
+            parallelism=hash_parallelism
         )
     else:
-        # Fallback to original hashing method
+        # Fallback to original scanning method; sizes come from the scanner's
+        # cached directory-entry stat rather than a second stat per file
+        files_with_size = (
+            (size, path)
+            for size, path in get_files_recursively(base_dir, exclude, exclude_dir, exclude_hidden, logger,
+                                                    max_workers=threads, yield_size=True)
+            if min_size < size < max_size
+        )
+        groups = _group_by_size(files_with_size, scan_complete)
+
         hash_results = batch_hash_files(
-            [p for _, p in files_with_size],
-            4096 if quick_mode else "auto",
+            [p for paths in groups.values() if len(paths) >= min_group_size for p in paths],
+            prefix_size if quick_mode else "auto",
             multi_region and not quick_mode,
-            threads,
-            progress_callback=quick_scan_progress if progress_callback else None
-        )
+            hash_threads,
+            progress_callback=quick_scan_progress if progress_callback else None,
+            algorithm=prefix_algorithm,
+            cache_path=hash_cache,
+            parallelism=hash_parallelism
+        ) if groups else {}
+
+    if not scanned:
+        if progress_callback:
+            progress_callback(100, "No files found matching criteria.")
+        return {}
+
+    if not groups and not hardlinks:
+        if progress_callback:
+            progress_callback(100, "Scan complete. No duplicates found.")
+        return {}
 
-    # Group files by size and hash
+    # Group files by size and hash; one dict lookup per path, since a file
+    # that failed to hash is simply absent from hash_results
     size_hash_groups = defaultdict(list)
-    for size, path in files_with_size:
-        if path in hash_results:
-            size_hash_groups[(size, hash_results[path])].append(path)
+    get_hash = hash_results.get
+    for size, paths in groups.items():
+        for path in paths:
+            digest = get_hash(path)
+            if digest is not None:
+                size_hash_groups[(size, digest)].append(path)
 
     if not quick_mode:
         if progress_callback:
             progress_callback(65, "Verifying full file hashes...")
 
+        def compare_progress(p: int):
+            if progress_callback:
+                # Scale this phase to be 65% -> 80% of total
+                progress_callback(65 + int(p * 0.15), f"Comparing... ({p}%)")
+
         def full_scan_progress(p: int):
             if progress_callback:
-                # Scale this phase to be 65% -> 95% of total
-                progress_callback(65 + int(p * 0.3), f"Verifying... ({p}%)")
+                # Scale this phase to be 80% -> 95% of total
+                progress_callback(80 + int(p * 0.15), f"Verifying... ({p}%)")
+
+        # Groups whose first-pass hash already read every byte are confirmed as is.
+        # Same-size pairs skipped the first pass and go straight to verification.
+        duplicates = defaultdict(list)
+        unverified = {(s, None): paths for s, paths in groups.items() if len(paths) < min_group_size}
+        for (s, h), paths in size_hash_groups.items():
+            if len(paths) < 2:
+                continue
+            if covers_whole_file(s, "auto", multi_region):
+                duplicates[(s, h)] = paths
+            else:
+                unverified[(s, h)] = paths
+
+        if not multi_region:
+            unverified = _screen_regions(unverified, hash_threads, prefix_algorithm, hash_cache,
+                                         hash_parallelism)
 
         # Get files that need full verification
-        verify_map = {p: (s, size_hash_groups[(s, h)]) for (
-            s, h), paths in size_hash_groups.items() for p in paths if len(paths) > 1}
+        verify_map = {p: s for (s, h), paths in unverified.items() for p in paths}
         
-        if not verify_map:  # No potential duplicates found
+        if not verify_map and not duplicates and not hardlinks:  # No potential duplicates found
             if progress_callback:
                 progress_callback(100, "Scan complete. No duplicates found.")
             return {}
 
-        # Use optimized hashing for verification
-        verify_results = batch_hash_files(
-            list(verify_map.keys()),
+        # A pair is compared byte by byte, which stops at the first differing
+        # block; larger groups are cheaper to hash once per file
+        pairs = [paths for paths in unverified.values() if len(paths) == 2]
+        to_hash = [p for paths in unverified.values() if len(paths) > 2 for p in paths]
+
+        verify_results = batch_compare_files(
+            pairs,
+            hash_threads,
+            progress_callback=compare_progress if progress_callback else None,
+            algorithm=full_algorithm,
+            cache_path=hash_cache
+        )
+        # Hashing cache-hot files end to end is CPU-bound, so large verification
+        # batches go to a process pool (small ones still run on threads)
+        verify_results.update(batch_hash_files(
+            to_hash,
             -1,
             False,
-            threads,
-            progress_callback=full_scan_progress if progress_callback else None
-        )
+            hash_threads,
+            progress_callback=full_scan_progress if progress_callback else None,
+            use_processes=True,
+            algorithm=full_algorithm,
+            inode_order=True,
+            file_sizes=verify_map,
+            file_inodes=inodes,
+            cache_path=hash_cache,
+            parallelism=hash_parallelism
+        ))
 
-        duplicates = defaultdict(list)
         for path, hash_val in verify_results.items():
-            size, _ = verify_map[path]
-            duplicates[(size, hash_val)].append(path)
+            duplicates[(verify_map[path], hash_val)].append(path)
 
-        if progress_callback:
-            progress_callback(100, "Scan complete.")
-        return {k: v for k, v in duplicates.items() if len(v) > 1}
+        result = {k: v for k, v in duplicates.items() if len(v) > 1}
     else:
-        if progress_callback:
-            progress_callback(100, "Scan complete.")
-        return {k: v for k, v in size_hash_groups.items() if len(v) > 1}
+        result = {k: v for k, v in size_hash_groups.items() if len(v) > 1}
+
+    if hardlinks:
+        # An inode whose first path is in no group still duplicates itself through
+        # its links; hash that one path so the group gets a (size, hash) key
+        grouped = {path for paths in result.values() for path in paths}
+        sizes = {}
+        for path in hardlinks:
+            if path not in grouped:
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except OSError as e:
+                    logger.warning(f"Cannot get size for: {path} ({e})")
+        digests = batch_hash_files(
+            list(sizes),
+            prefix_size if quick_mode else -1,
+            False,
+            hash_threads,
+            algorithm=prefix_algorithm if quick_mode else full_algorithm,
+            file_sizes=sizes,
+            cache_path=hash_cache,
+            parallelism=hash_parallelism
+        ) if sizes else {}
+        result = _merge_hardlinks(
+            result, hardlinks, {path: (sizes[path], digest) for path, digest in digests.items()})
+
+    if progress_callback:
+        progress_callback(100, "Scan complete.")
+    return result
@@ -1,28 +1,50 @@
 import os
 import logging
-from typing import List, Dict, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+MAX_DELETE_THREADS = 32  # Concurrent unlink calls; metadata updates stop scaling beyond this
+
+
+def _remove(path: str) -> Optional[Exception]:
+    """Remove a file, returning the error instead of raising it."""
+    try:
+        os.remove(path)
+    except Exception as e:
+        return e
+    return None
+
 
 def delete_files(files_to_delete: List[str], dry_run: bool, logger_obj: logging.Logger = logger):
     """
     Deletes a list of files, with an option for a dry run.
 
+    Files are removed concurrently, since each removal waits on a filesystem
+    metadata update; results are logged in the order the paths were given.
+
     Args:
         files_to_delete: A list of file paths to be deleted.
         dry_run: If True, only log the files that would be deleted without actually deleting them.
         logger_obj: The logger to use for output.
     """
-    for path in files_to_delete:
-        if dry_run:
+    if dry_run:
+        for path in files_to_delete:
             logger_obj.info(f"[DRY-RUN] Would delete: {path}")
+        return
+
+    if len(files_to_delete) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_DELETE_THREADS, len(files_to_delete))) as executor:
+            errors = list(executor.map(_remove, files_to_delete))
+    else:
+        errors = [_remove(path) for path in files_to_delete]
+
+    for path, error in zip(files_to_delete, errors):
+        if error is None:
+            logger_obj.info(f"Deleted: {path}")
         else:
-            try:
-                os.remove(path)
-                logger_obj.info(f"Deleted: {path}")
-            except Exception as e:
-                logger_obj.error(f"Failed to delete {path}: {e}")
+            logger_obj.error(f"Failed to delete {path}: {error}")
 
 
 def handle_deletion(duplicates: Dict[Tuple[int, str], List[str]], args: Any, logger_obj: logging.Logger = logger):
@@ -40,16 +62,18 @@ def handle_deletion(duplicates: Dict[Tuple[int, str], List[str]], args: Any, log
             logger_obj.info("Deletion cancelled.")
             return
 
+    # Without prompts every group's files are deleted together in one batch
+    pending: List[str] = []
     for (size, hash_val), paths in sorted(duplicates.items()):
         if len(paths) < 2:
             continue
 
         to_delete: List[str] = []
         if args.interactive:
-            print(
-                f"\nDuplicate group (Size: {size}, Hash: {hash_val[:8]}...):")
-            for i, p in enumerate(paths):
-                print(f"  [{i}] {p}")
+            # One write per group rather than one per listed file
+            listing = [f"\nDuplicate group (Size: {size}, Hash: {hash_val[:8]}...):"]
+            listing.extend(f"  [{i}] {p}" for i, p in enumerate(paths))
+            print("\n".join(listing))
             choice = input(
                 "Enter file indices to delete (comma-separated), 'a' for all but first, or 's' to skip: ").strip().lower()
 
@@ -66,8 +90,11 @@ def handle_deletion(duplicates: Dict[Tuple[int, str], List[str]], args: Any, log
                     logger_obj.warning(f"Invalid input: {choice}. Skipping group.")
                     continue
         else:
-            to_delete = paths[1:]
+            pending.extend(paths[1:])
 
         if to_delete:
             delete_files(to_delete, args.dry_run, logger_obj)
 
+    if pending:
+        delete_files(pending, args.dry_run, logger_obj)
+
@@ -163,13 +163,18 @@ def print_demo_results(duplicates: Dict[Tuple[int, str], List[str]],
     
     logger.info("\n📋 Duplicate Groups Found:")
     logger.info("-" * 40)
-    
+
+    cwd_prefix = os.path.join(os.getcwd(), "")
     for i, ((size, hash_val), paths) in enumerate(duplicates.items(), 1):
-        logger.info(f"\n🔍 Group {i} (Size: {format_bytes(size)}, Hash: {hash_val[:8]}...)")
+        logger.info("\n🔍 Group %d (Size: %s, Hash: %s...)", i, format_bytes(size), hash_val[:8])
         for j, path in enumerate(paths):
-            # Show relative path for cleaner output
-            rel_path = os.path.relpath(path)
-            logger.info(f"  [{j}] {rel_path}")
+            # Show relative path for cleaner output; paths under the working
+            # directory are shortened without relpath's per-call getcwd
+            if path.startswith(cwd_prefix):
+                rel_path = path[len(cwd_prefix):]
+            else:
+                rel_path = os.path.relpath(path)
+            logger.info("  [%d] %s", j, rel_path)
     
     logger.info("\n✅ Demo completed successfully!")
     logger.info("💡 This demonstrates how the tool identifies and groups duplicate files.")
@@ -1,6 +1,44 @@
 import json
 import csv
-from typing import Dict, List, Tuple, Any
+import os
+from typing import Dict, List, Tuple, Any, Optional, IO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+CSV_FIELDS = ("size_bytes", "hash", "path")
+EXPORT_BUFSIZE = 1024 * 1024  # Output buffer, so large exports flush in few write calls
+
+
+def _dump_record(record: Dict[str, Any]) -> str:
+    """
+    Serialize one JSON record, using orjson when it is installed.
+
+    orjson rejects strings that are not valid UTF-8, such as file names with
+    undecodable bytes (which Python surrogate-escapes); those records fall
+    back to ``json.dumps``, which writes them as ``\\udcXX`` escapes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(record).decode("utf-8")
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            pass
+    return json.dumps(record)
+
+
+def _open_output(path: Optional[str], label: str, logger: Any,
+                 **kwargs: Any) -> Optional[IO[str]]:
+    """Open an export target, logging (not raising) on failure."""
+    if not path:
+        return None
+    try:
+        return open(path, 'w', buffering=EXPORT_BUFSIZE, **kwargs)
+    except Exception as e:
+        logger.error(f"{label} export failed: {e}")
+        return None
 
 
 def export_results(
@@ -14,7 +52,8 @@ def export_results(
     This function takes the results of a duplicate file scan and exports them
     to the specified output formats. JSON export creates a structured format
     with all duplicate groups, while CSV export creates a flat list with one
-    row per duplicate file.
+    row per duplicate file. Both files are written in a single pass over
+    ``duplicates``, so no intermediate copy of the results is built.
 
     Args:
         duplicates: A dictionary mapping (file_size, file_hash) tuples to lists
@@ -29,31 +68,77 @@ def export_results(
         # Creates results.json with the duplicate data
 
     Note:
-        - JSON format groups duplicates by size and hash
+        - JSON format groups duplicates by size and hash, one group per line
         - CSV format creates one row per duplicate file
         - Both formats include file size, hash, and file paths
+        - orjson is used for JSON serialization when installed
+        - JSON is written as UTF-8; a format whose export fails leaves no file behind
     """
-    data = [{"size_bytes": size, "hash": hash, "paths": paths}
-            for (size, hash), paths in duplicates.items()]
+    # orjson emits raw UTF-8, which the locale encoding may not be able to hold
+    json_file = _open_output(getattr(args, "json_out", None), "JSON", logger,
+                             encoding='utf-8')
+    csv_file = _open_output(getattr(args, "csv_out", None), "CSV", logger,
+                            newline='')
+    if json_file is None and csv_file is None:
+        return
 
-    if args.json_out:
+    def fail(handle: IO[str], label: str, error: Exception) -> None:
+        """Log an export error, stop writing that format and remove its partial file."""
+        logger.error(f"{label} export failed: {error}")
         try:
-            with open(args.json_out, 'w') as jf:
-                json.dump(data, jf, indent=2)
-            logger.info(f"Written to JSON: {args.json_out}")
-        except Exception as e:
-            logger.error(f"JSON export failed: {e}")
-
-    if args.csv_out:
+            handle.close()
+        except Exception:
+            pass
         try:
-            with open(args.csv_out, 'w', newline='') as cf:
-                writer = csv.DictWriter(
-                    cf, fieldnames=["size_bytes", "hash", "path"])
-                writer.writeheader()
-                for row in data:
-                    for path in row['paths']:
-                        writer.writerow(
-                            {"size_bytes": row['size_bytes'], "hash": row['hash'], "path": path})
-            logger.info(f"Written to CSV: {args.csv_out}")
-        except Exception as e:
-            logger.error(f"CSV export failed: {e}")
+            os.remove(handle.name)
+        except OSError:
+            pass
+        return None
+
+    try:
+        if json_file is not None:
+            try:
+                json_file.write("[")
+            except Exception as e:
+                json_file = fail(json_file, "JSON", e)
+        csv_writer = csv.writer(csv_file) if csv_file is not None else None
+        if csv_file is not None:
+            try:
+                csv_writer.writerow(CSV_FIELDS)
+            except Exception as e:
+                csv_file = fail(csv_file, "CSV", e)
+
+        separator = "\n"
+        for (size, file_hash), paths in duplicates.items():
+            if json_file is not None:
+                try:
+                    json_file.write(separator + _dump_record(
+                        {"size_bytes": size, "hash": file_hash, "paths": paths}))
+                    separator = ",\n"
+                except Exception as e:
+                    json_file = fail(json_file, "JSON", e)
+            if csv_file is not None:
+                try:
+                    csv_writer.writerows((size, file_hash, path) for path in paths)
+                except Exception as e:
+                    csv_file = fail(csv_file, "CSV", e)
+
+        if json_file is not None:
+            try:
+                json_file.write("\n]\n")
+                json_file.close()
+                logger.info(f"Written to JSON: {args.json_out}")
+            except Exception as e:
+                fail(json_file, "JSON", e)
+            json_file = None
+        if csv_file is not None:
+            try:
+                csv_file.close()
+                logger.info(f"Written to CSV: {args.csv_out}")
+            except Exception as e:
+                fail(csv_file, "CSV", e)
+            csv_file = None
+    finally:
+        for handle in (json_file, csv_file):
+            if handle is not None:
+                handle.close()
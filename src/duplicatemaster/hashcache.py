@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import time
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+def _default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "duplicate-master")
+
+
+DEFAULT_CACHE_PATH = os.path.join(_default_cache_dir(), "hashes.db")
+# A file modified within this window of being hashed may change again without
+# its mtime moving, so its digest is not stored
+RACY_WINDOW_NS = 2_000_000_000
+SQLITE_BUSY_TIMEOUT = 30.0  # Seconds to wait for another worker's write transaction
+MAX_CACHE_ENTRIES = 200_000  # Least recently used entries beyond this are evicted
+
+CacheKey = Tuple[int, int, int, int, str]
+
+
+def _signed64(value: int) -> int:
+    """Fold an unsigned 64-bit device or inode number into SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class HashCache:
+    """
+    Persistent map from file identity and hashing mode to a content digest.
+
+    Entries are keyed by (device, inode, size, mtime_ns, mode), so a file that
+    is modified, replaced or hashed with different settings misses the cache.
+    The database uses WAL journaling so several hashing workers can read it
+    while one of them writes. Each entry records when it was last stored or
+    hit, and the least recently used entries are evicted once the table grows
+    beyond ``max_entries``.
+
+    Args:
+        path: Location of the SQLite database; parent directories are created.
+        max_entries: Number of entries kept after each write.
+
+    Examples:
+        >>> with HashCache("/tmp/hashes.db") as cache:
+        ...     key = cache.key(os.stat("file.bin"), "blake2b:-1:0")
+        ...     digest = cache.get(key)
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = MAX_CACHE_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._hits: List[CacheKey] = []
+        self._last_used = 0
+        # Upper bound on the table's size (None until counted): rows inserted
+        # through this connection are added to it, so the table is only counted
+        # again once it may have outgrown max_entries
+        self._rows: Optional[int] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A hashing worker's connection is closed by the thread that ran its pool
+        self.connection = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+        try:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "dev INTEGER NOT NULL, ino INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, mode TEXT NOT NULL, digest TEXT NOT NULL, "
+                "used INTEGER NOT NULL, "
+                "PRIMARY KEY (dev, ino, size, mtime_ns, mode)) WITHOUT ROWID"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS hashes_used ON hashes (used)")
+            self.connection.commit()
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+    @staticmethod
+    def key(st: os.stat_result, mode: str) -> CacheKey:
+        """Build the cache key for a file's stat result and hashing mode."""
+        return (_signed64(st.st_dev), _signed64(st.st_ino), st.st_size, st.st_mtime_ns, mode)
+
+    @staticmethod
+    def is_stable(st: os.stat_result) -> bool:
+        """Return True if the file was last modified long enough ago to cache its digest."""
+        return time.time_ns() - st.st_mtime_ns >= RACY_WINDOW_NS
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """
+        Return the cached digest for ``key``, or None on a miss or database error.
+
+        Hits are remembered and their recency is written with the next
+        ``put_many``, ``flush`` or ``close``, so lookups never start a write
+        transaction.
+        """
+        try:
+            row = self.connection.execute(
+                "SELECT digest FROM hashes WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND mode=?",
+                key
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self._hits.append(key)
+        return row[0]
+
+    def put_many(self, entries: Iterable[Tuple[CacheKey, str]]) -> None:
+        """
+        Store (key, digest) pairs in a single transaction; a failed write is dropped.
+
+        The same transaction refreshes the recency of earlier hits and evicts
+        the least recently used entries beyond ``max_entries``.
+        """
+        entries = list(entries)
+        if not entries:
+            self.flush()
+            return
+        now = self._next_used()
+        try:
+            with self.connection:
+                inserted = self.connection.executemany(
+                    "INSERT OR REPLACE INTO hashes (dev, ino, size, mtime_ns, mode, digest, used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key + (digest, now) for key, digest in entries)
+                ).rowcount
+                self._touch_hits(now)
+                if inserted > 0:
+                    if self._rows is not None:
+                        self._rows += inserted
+                    if self._rows is None or self._rows > self.max_entries:
+                        self._evict()
+        except sqlite3.Error:
+            self._rows = None
+
+    def flush(self) -> None:
+        """Write the recency of hits since the last write in one transaction; failures are dropped."""
+        if not self._hits:
+            return
+        try:
+            with self.connection:
+                self._touch_hits(self._next_used())
+        except sqlite3.Error:
+            pass
+
+    def _next_used(self) -> int:
+        """Return the recency stamp for a write; strictly increasing, so a coarse clock cannot tie two."""
+        self._last_used = max(time.time_ns(), self._last_used + 1)
+        return self._last_used
+
+    def _touch_hits(self, now: int) -> None:
+        """Mark the entries hit since the last write as used at ``now``."""
+        hits, self._hits = self._hits, []
+        if hits:
+            self.connection.executemany(
+                "UPDATE hashes SET used=? "
+                "WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND mode=?",
+                ((now,) + key for key in hits)
+            )
+
+    def _evict(self) -> None:
+        """Count the table and delete the least recently used entries beyond ``max_entries``."""
+        rows = self.connection.execute("SELECT count(*) FROM hashes").fetchone()[0]
+        excess = rows - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM hashes WHERE (dev, ino, size, mtime_ns, mode) IN ("
+                "SELECT dev, ino, size, mtime_ns, mode FROM hashes ORDER BY used LIMIT ?)",
+                (excess,)
+            )
+            rows -= excess
+        self._rows = rows
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -2,24 +2,248 @@ import os
 import sys
 import hashlib
 import mmap
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Union, Optional, Callable
+import multiprocessing
+import queue
+import threading
+from contextlib import nullcontext
+from itertools import islice
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+)
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Set, Union, Optional, Callable, Tuple
 import logging
+import sqlite3
 from tqdm import tqdm
+from .hashcache import HashCache
+
+try:
+    # libsodium's BLAKE2b uses AVX2 where the CPU has it; digests match hashlib's
+    import nacl.hashlib as sodium_hashlib
+except ImportError:
+    sodium_hashlib = None
 
 DEFAULT_THREADS = min(32, (os.cpu_count() or 1) + 4)
 # Optimized buffer sizes for better performance
 LARGE_BUFFER_SIZE = 64 * 1024  # 64KB for large files
 MEDIUM_BUFFER_SIZE = 32 * 1024  # 32KB for medium files
 SMALL_BUFFER_SIZE = 16 * 1024  # 16KB for small files
-MEMORY_MAP_THRESHOLD = 10 * 1024 * 1024  # 10MB threshold for memory mapping
+MEMORY_MAP_THRESHOLD = 1024 * 1024  # 1MB threshold for memory mapping
+PREFIX_BUFSIZE = 64 * 1024  # Bytes hashed per file in quick mode
+# In 'auto' mode files up to this size are hashed whole: one read either way,
+# and the digest then never needs a second, full-file pass
+WHOLE_FILE_THRESHOLD = 64 * 1024
+# Below this many files a process pool costs more to start than it saves
+PROCESS_POOL_MIN_FILES = 256
+# How batch hashing is parallelised: 'auto' picks a process pool for large
+# batches, 'threads' and 'processes' force one kind of pool
+HASH_PARALLELISM = ("auto", "threads", "processes")
+MAX_HASH_BATCH_SIZE = 256  # Upper bound on files hashed per submitted task
+BLAKE3_MMAP_THRESHOLD = 1024 * 1024  # 1MB; larger files use blake3's parallel mmap hashing
+COMPARE_BUFSIZE = 256 * 1024  # Block size for lockstep byte-by-byte comparison
+PIPELINE_QUEUE_SIZE = 10_000  # Scanned files buffered ahead of the dispatcher
+PIPELINE_CHUNK_SIZE = 256  # Scanned files handed over per queue operation
+PIPELINE_BATCH_SIZE = 64  # Files per task while scanning and hashing overlap
+# Files hashed whole above this size are dropped from the page cache afterwards,
+# so scanning a large tree does not evict the user's working set
+DONTNEED_THRESHOLD = 64 * 1024 * 1024
+# Mappings larger than this are hashed one slice at a time, and each hashed
+# slice is unmapped from the process so resident memory stays bounded
+MMAP_SLICE_THRESHOLD = 1024 * 1024 * 1024
+MMAP_SLICE_SIZE = 64 * 1024 * 1024  # Must be a multiple of mmap.ALLOCATIONGRANULARITY
+ROTATIONAL_MAX_THREADS = 4  # Concurrent readers on a spinning disk before seeks dominate
+# Groups of files at least this large whose prefixes match are screened by
+# their middle and last 4KB before being read in full
+REGION_SCREEN_MIN_SIZE = 1024 * 1024
+
+# Content hash algorithms and the optional package each one needs
+HASH_ALGORITHMS = {
+    "blake2b": None,
+    "blake3": "blake3",
+    "xxh3": "xxhash",
+}
+DEFAULT_HASH_ALGORITHM = "blake2b"
+# BLAKE2b for prefix hashes, BLAKE3 (when installed) for full-file verification
+AUTO_HASH_ALGORITHM = "auto"
+
+# 128-bit digests: ample for telling files apart, and a quarter the size of a
+# BLAKE2b-512 hex key in the grouping dicts
+DIGEST_SIZE = 16
+SODIUM_UPDATE_CHUNK = 1024 * 1024  # Slice size when feeding non-bytes buffers to libsodium
 
 logger = logging.getLogger(__name__)
 
 
-def blake2bsum(filename: str, buffer_size: Union[int, str], multi_region: bool) -> str:
+class _SodiumBlake2b:
+    """
+    BLAKE2b backed by libsodium with the subset of the hashlib API used here.
+
+    PyNaCl only accepts ``bytes``, so memoryviews and memory mappings are fed in
+    slices of SODIUM_UPDATE_CHUNK; copying a slice that is already in cache costs
+    far less than hashing it.
+    """
+
+    def __init__(self) -> None:
+        self._h = sodium_hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+    def update(self, data: Any) -> None:
+        if isinstance(data, bytes):
+            self._h.update(data)
+            return
+        with memoryview(data) as view, view.cast('B') as flat:
+            for start in range(0, len(flat), SODIUM_UPDATE_CHUNK):
+                self._h.update(bytes(flat[start:start + SODIUM_UPDATE_CHUNK]))
+
+    def digest(self) -> bytes:
+        return self._h.digest()
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigest()
+
+
+def is_hash_algorithm_available(algorithm: str) -> bool:
+    """Return True if the package needed by ``algorithm`` can be imported."""
+    package = HASH_ALGORITHMS.get(algorithm)
+    if package is None:
+        return algorithm in HASH_ALGORITHMS
+    try:
+        __import__(package)
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_hash_algorithms(algorithm: str) -> Tuple[str, str]:
+    """
+    Return the (first-pass, full-file) hash algorithms for a ``--hash`` setting.
+
+    'auto' keeps BLAKE2b for prefix and multi-region hashes, so quick-mode
+    digests stay comparable across versions, and verifies whole files with
+    BLAKE3 when the package is installed. Any other value is used for both.
+    """
+    if algorithm != AUTO_HASH_ALGORITHM:
+        return algorithm, algorithm
+    full = "blake3" if is_hash_algorithm_available("blake3") else DEFAULT_HASH_ALGORITHM
+    return DEFAULT_HASH_ALGORITHM, full
+
+
+def _hexdigest(h: Any) -> str:
+    """Return the first DIGEST_SIZE bytes of a hash object's digest as hex."""
+    return h.hexdigest()[:DIGEST_SIZE * 2]
+
+
+def _new_hasher(algorithm: str) -> Any:
+    """
+    Create a fresh hash object for ``algorithm``.
+
+    Duplicate detection does not need collision resistance against adversarial
+    inputs, so the faster BLAKE3 and XXH3-128 are offered next to BLAKE2b.
+    """
+    if algorithm == "blake2b":
+        return _SodiumBlake2b() if sodium_hashlib is not None else hashlib.blake2b(digest_size=DIGEST_SIZE)
+    if algorithm == "blake3":
+        import blake3
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    if algorithm == "xxh3":
+        import xxhash
+        return xxhash.xxh3_128()
+    raise ValueError(f"Unknown hash algorithm: {algorithm}")
+
+
+def _resolve_buffer_size(file_size: int, buffer_size: Union[int, str]) -> int:
+    """Turn a buffer size setting ('auto', -1 or a byte count) into a byte count or -1."""
+    # Determine the actual buffer size with optimized defaults
+    if buffer_size == "auto":
+        if file_size <= WHOLE_FILE_THRESHOLD:
+            return -1  # Read entire small files
+        elif file_size <= 1024 * 1024:  # 1MB
+            return SMALL_BUFFER_SIZE
+        elif file_size <= 100 * 1024 * 1024:  # 100MB
+            return MEDIUM_BUFFER_SIZE
+        else:
+            return LARGE_BUFFER_SIZE
+    elif isinstance(buffer_size, int):
+        return buffer_size
+    else:
+        raise TypeError("buffer_size must be an int or 'auto'")
+
+
+def covers_whole_file(file_size: int, buffer_size: Union[int, str], multi_region: bool) -> bool:
+    """
+    Return True if ``blake2bsum`` with these settings reads every byte of the file.
+
+    Such a digest equals the full-file hash, so a later full-file pass over the
+    same file would only repeat the work.
+    """
+    actual_buffer_size = _resolve_buffer_size(file_size, buffer_size)
+    if actual_buffer_size == -1:
+        return not (multi_region and file_size > MEMORY_MAP_THRESHOLD)
+    if multi_region and file_size > 12288:
+        return False
+    return actual_buffer_size >= file_size
+
+
+def _cache_mode(file_size: int, buffer_size: Union[int, str], multi_region: bool, algorithm: str) -> str:
+    """
+    Describe what ``blake2bsum`` hashes with these settings, for use in a cache key.
+
+    Every setting that reads the whole file maps to the same mode, so a digest
+    stored by a quick pass over a small file is reused by full verification.
+    """
+    if covers_whole_file(file_size, buffer_size, multi_region):
+        return f"{algorithm}:full"
+    return f"{algorithm}:{_resolve_buffer_size(file_size, buffer_size)}:{int(multi_region)}"
+
+
+# Hash cache connections keyed by (process id, thread id, path), so each
+# worker thread or process opens the database once and reuses it across tasks
+_worker_caches: Dict[Tuple[int, int, str], HashCache] = {}
+_worker_caches_lock = threading.Lock()
+
+
+def _open_cache(cache_path: Optional[str]) -> Optional[HashCache]:
+    """
+    Return the calling worker's hash cache connection, opening it on first use.
+
+    Hashing goes on without the cache if it cannot be opened. Connections of
+    thread pool workers are closed by ``_close_worker_caches`` once the pool
+    has shut down; process pool workers keep theirs until they exit.
+    """
+    if cache_path is None:
+        return None
+    key = (os.getpid(), threading.get_ident(), cache_path)
+    cache = _worker_caches.get(key)
+    if cache is not None:
+        return cache
+    try:
+        cache = HashCache(cache_path)
+    except (OSError, sqlite3.Error) as e:
+        logger.debug(f"Hash cache {cache_path} unavailable: {e}")
+        return None
+    with _worker_caches_lock:
+        _worker_caches[key] = cache
+    return cache
+
+
+def _close_worker_caches() -> None:
+    """Close the cache connections of this process's threads that have exited."""
+    pid = os.getpid()
+    alive = {thread.ident for thread in threading.enumerate()}
+    with _worker_caches_lock:
+        stale = [key for key in _worker_caches if key[0] == pid and key[1] not in alive]
+        caches = [_worker_caches.pop(key) for key in stale]
+    for cache in caches:
+        cache.close()
+
+
+def blake2bsum(
+    filename: str,
+    buffer_size: Union[int, str],
+    multi_region: bool,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    file_size: Optional[int] = None
+) -> str:
     """
-    Computes the BLAKE2b hash of a file with optimized I/O handling.
+    Computes the hash of a file (BLAKE2b by default) with optimized I/O handling.
 
     Args:
         filename: Path to the file.
@@ -28,44 +252,63 @@ def blake2bsum(filename: str, buffer_size: Union[int, str], multi_region: bool)
                      -1 reads the whole file.
         multi_region: If True, hashes three regions of the file (start, middle, end).
                       Otherwise, hashes from the beginning of the file.
+        algorithm: One of HASH_ALGORITHMS ('blake2b', 'blake3', 'xxh3').
+        file_size: Size already known from the scan; saves a stat call.
 
     Returns:
         The hex digest of the file's hash.
     """
-    h = hashlib.blake2b()
-    
-    try:
-        file_size = os.path.getsize(filename)
-    except OSError:
-        raise OSError(f"Cannot get file size for {filename}")
+    if file_size is None:
+        try:
+            file_size = os.path.getsize(filename)
+        except OSError:
+            raise OSError(f"Cannot get file size for {filename}")
 
-    # Determine the actual buffer size with optimized defaults
-    actual_buffer_size: Optional[int]
-    if buffer_size == "auto":
-        if file_size <= 8192:
-            actual_buffer_size = -1  # Read entire small files
-        elif file_size <= 1024 * 1024:  # 1MB
-            actual_buffer_size = SMALL_BUFFER_SIZE
-        elif file_size <= 100 * 1024 * 1024:  # 100MB
-            actual_buffer_size = MEDIUM_BUFFER_SIZE
-        else:
-            actual_buffer_size = LARGE_BUFFER_SIZE
-    elif isinstance(buffer_size, int):
-        actual_buffer_size = buffer_size
-    else:
-        raise TypeError("buffer_size must be an int or 'auto'")
+    actual_buffer_size = _resolve_buffer_size(file_size, buffer_size)
+
+    # BLAKE3 hashes a memory mapping with SIMD and multiple threads internally
+    if (algorithm == "blake3" and actual_buffer_size == -1 and not multi_region
+            and file_size > BLAKE3_MMAP_THRESHOLD):
+        h = _new_hasher(algorithm)
+        h.update_mmap(filename)
+        if file_size > DONTNEED_THRESHOLD:
+            with open(filename, 'rb') as f:
+                _fadvise(f, "POSIX_FADV_DONTNEED")
+        return _hexdigest(h)
 
     # Use memory mapping for large files when reading entire content
     if actual_buffer_size == -1 and file_size > MEMORY_MAP_THRESHOLD:
-        return _hash_with_memory_map(filename, multi_region)
+        return _hash_with_memory_map(filename, multi_region, algorithm)
     
     # Use optimized file reading
-    return _hash_with_file_reading(filename, file_size, actual_buffer_size, multi_region)
+    return _hash_with_file_reading(filename, file_size, actual_buffer_size, multi_region, algorithm)
+
 
+def _hash_mapping_in_slices(h: Any, mm: mmap.mmap) -> None:
+    """
+    Feed a large mapping to ``h`` in ``MMAP_SLICE_SIZE`` slices.
 
-def _hash_with_memory_map(filename: str, multi_region: bool) -> str:
+    Each slice is prefetched before it is hashed and dropped from the
+    process's page tables afterwards, so hashing a multi-gigabyte file does
+    not grow resident memory by the file's size.
+    """
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    size = len(mm)
+    with memoryview(mm) as view:
+        for start in range(0, size, MMAP_SLICE_SIZE):
+            length = min(MMAP_SLICE_SIZE, size - start)
+            if hasattr(mmap, "MADV_WILLNEED"):
+                mm.madvise(mmap.MADV_WILLNEED, start, length)
+            with view[start:start + length] as chunk:
+                h.update(chunk)
+            if hasattr(mmap, "MADV_DONTNEED"):
+                mm.madvise(mmap.MADV_DONTNEED, start, length)
+
+
+def _hash_with_memory_map(filename: str, multi_region: bool, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
     """Hash a file using memory mapping for better performance on large files."""
-    h = hashlib.blake2b()
+    h = _new_hasher(algorithm)
     
     with open(filename, 'rb') as f:
         with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
@@ -74,34 +317,405 @@ def _hash_with_memory_map(filename: str, multi_region: bool) -> str:
                 for pos in [0, len(mm) // 2 - 2048, max(0, len(mm) - 4096)]:
                     h.update(mm[pos:pos + 4096])
             else:
-                # Full file hashing with memory mapping
-                h.update(mm)
+                # Full file hashing with memory mapping: the hasher walks the
+                # mapping in C with no read syscalls or per-chunk bytes objects
+                _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+                if len(mm) > MMAP_SLICE_THRESHOLD:
+                    _hash_mapping_in_slices(h, mm)
+                else:
+                    for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+                        if hasattr(mmap, advice):
+                            mm.madvise(getattr(mmap, advice))
+                    h.update(mm)
+                if len(mm) > DONTNEED_THRESHOLD:
+                    _fadvise(f, "POSIX_FADV_DONTNEED")
     
-    return h.hexdigest()
+    return _hexdigest(h)
 
 
-def _hash_with_file_reading(filename: str, file_size: int, buffer_size: int, multi_region: bool) -> str:
+def _hash_with_file_reading(
+    filename: str,
+    file_size: int,
+    buffer_size: int,
+    multi_region: bool,
+    algorithm: str = DEFAULT_HASH_ALGORITHM
+) -> str:
     """Hash a file using optimized file reading."""
-    h = hashlib.blake2b()
-    
+    if multi_region and buffer_size != -1 and file_size > 12288:
+        return _hash_regions(filename, file_size, algorithm)
+    if buffer_size != -1:
+        return _hash_head(filename, buffer_size, algorithm)
+
     with open(filename, 'rb') as f:
-        if multi_region and buffer_size != -1 and file_size > 12288:
-            # Multi-region hashing
-            for pos in [0, file_size // 2 - 2048, max(0, file_size - 4096)]:
+        _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+        digest = _hash_whole_file(f, algorithm)
+        if file_size > DONTNEED_THRESHOLD:
+            _fadvise(f, "POSIX_FADV_DONTNEED")
+        return digest
+
+
+def _hash_head(filename: str, length: int, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    Hash the first ``length`` bytes of a file.
+
+    Like ``_hash_regions`` this is one ``os.pread`` on a raw descriptor where
+    available, with no buffered file object, and it gives no sequential-access
+    hint: the kernel's default readahead already covers a head read, and a
+    larger window would pull in data the prefix pass never looks at.
+    """
+    h = _new_hasher(algorithm)
+    if hasattr(os, "pread"):
+        fd = os.open(filename, os.O_RDONLY)
+        try:
+            h.update(os.pread(fd, length, 0))
+        finally:
+            os.close(fd)
+    else:
+        with open(filename, 'rb') as f:
+            h.update(f.read(length))
+    return _hexdigest(h)
+
+
+def _hash_regions(filename: str, file_size: int, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    Hash 4KB from the start, middle and end of a file.
+
+    Uses ``os.pread`` on a raw descriptor where available, so each region is a
+    single positioned read with no seek or buffered-IO bookkeeping in between.
+    """
+    h = _new_hasher(algorithm)
+    regions = (0, file_size // 2 - 2048, max(0, file_size - 4096))
+
+    if hasattr(os, "pread"):
+        fd = os.open(filename, os.O_RDONLY)
+        try:
+            for pos in regions:
+                h.update(os.pread(fd, 4096, pos))
+        finally:
+            os.close(fd)
+    else:
+        with open(filename, 'rb') as f:
+            for pos in regions:
                 f.seek(pos)
                 h.update(f.read(4096))
-        else:
-            # Full file or partial hashing
-            if buffer_size == -1:
-                # Read entire file in optimized chunks
-                chunk_size = LARGE_BUFFER_SIZE
-                while chunk := f.read(chunk_size):
-                    h.update(chunk)
-            else:
-                # Read only the specified buffer size
-                h.update(f.read(buffer_size))
-    
-    return h.hexdigest()
+
+    return _hexdigest(h)
+
+
+def _hash_whole_file(f: BinaryIO, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    Hash an already opened file from start to end with a single ``read`` call.
+
+    ``blake2bsum`` only sends files up to ``MEMORY_MAP_THRESHOLD`` here (larger
+    ones are hashed from a memory mapping), so the read is one syscall and a
+    bounded allocation where a streamed digest would issue several.
+    """
+    h = _new_hasher(algorithm)
+    h.update(f.read())
+    return _hexdigest(h)
+
+
+def _fadvise(f: BinaryIO, advice: str) -> None:
+    """Pass an ``os.POSIX_FADV_*`` hint covering the whole file, where supported."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+        except (OSError, AttributeError):
+            pass
+
+
+def files_equal(paths: List[str], algorithm: str = DEFAULT_HASH_ALGORITHM) -> Optional[str]:
+    """
+    Compare files byte by byte, reading them in lockstep.
+
+    Stops at the first differing block, so two files that diverge early are
+    never read in full. The first file's content is hashed as it is read, so a
+    match yields the same digest ``blake2bsum(path, -1, False, algorithm)`` would.
+
+    Args:
+        paths: Files of equal size to compare.
+        algorithm: Hash algorithm used for the returned digest.
+
+    Returns:
+        The content digest if all files are identical, otherwise None.
+
+    Raises:
+        OSError: If a file cannot be opened or read.
+    """
+    h = _new_hasher(algorithm)
+    files = []
+    compared = 0
+    try:
+        for path in paths:
+            f = open(path, 'rb', buffering=0)
+            files.append(f)
+            _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+        while True:
+            blocks = [f.read(COMPARE_BUFSIZE) for f in files]
+            if not all(b == blocks[0] for b in blocks):
+                return None
+            if not blocks[0]:
+                return _hexdigest(h)
+            h.update(blocks[0])
+            compared += len(blocks[0])
+    finally:
+        for f in files:
+            # Each file is read once; keep large ones from crowding the page cache
+            if compared > DONTNEED_THRESHOLD:
+                _fadvise(f, "POSIX_FADV_DONTNEED")
+            f.close()
+
+
+def _compare_group(
+    paths: List[str],
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    cache_path: Optional[str] = None
+) -> Optional[str]:
+    """
+    Run ``files_equal`` on a group, answering from the hash cache when possible.
+
+    If every file has a cached full-file digest the files are not read at all.
+    Otherwise they are compared, and an identical group's digest is cached.
+    """
+    cache = _open_cache(cache_path)
+    if cache is None:
+        return files_equal(paths, algorithm)
+    stats = [os.stat(path) for path in paths]
+    mode = _cache_mode(stats[0].st_size, -1, False, algorithm)
+    keys = [cache.key(st, mode) for st in stats]
+    cached = [cache.get(key) for key in keys]
+    if None not in cached:
+        cache.flush()
+        return cached[0] if len(set(cached)) == 1 else None
+    digest = files_equal(paths, algorithm)
+    cache.put_many((key, digest) for key, st in zip(keys, stats)
+                   if digest is not None and cache.is_stable(st))
+    return digest
+
+
+def batch_compare_files(
+    groups: List[List[str]],
+    threads: int,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    cache_path: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Verify candidate groups with ``files_equal`` in parallel.
+
+    Args:
+        groups: Lists of same-size files that are suspected duplicates.
+        threads: The number of threads to use.
+        progress_callback: An optional callback to report progress percentage.
+        algorithm: Hash algorithm used for the returned digests.
+        cache_path: SQLite hash cache to consult and update (None to disable).
+
+    Returns:
+        A dictionary mapping every file of each identical group to its digest.
+        Files from groups that differ or could not be read are omitted.
+    """
+    results: Dict[str, str] = {}
+    if not groups:
+        return results
+
+    total = len(groups)
+    last_percent = -1
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = {executor.submit(_compare_group, group, algorithm, cache_path): group
+                   for group in groups}
+        for completed, future in enumerate(as_completed(futures), 1):
+            group = futures[future]
+            try:
+                digest = future.result()
+            except OSError as e:
+                logger.error(f"Could not compare {', '.join(group)}: {e}")
+                digest = None
+            if digest is not None:
+                for path in group:
+                    results[path] = digest
+            if progress_callback:
+                percent = int((completed / total) * 100)
+                if percent >= last_percent + 5:
+                    progress_callback(percent)
+                    last_percent = percent
+    _close_worker_caches()
+
+    if progress_callback and last_percent < 100:
+        progress_callback(100)
+
+    return results
+
+
+def is_rotational(path: str) -> bool:
+    """
+    Return True if ``path`` lives on a rotational disk.
+
+    Reads the Linux block-device ``queue/rotational`` flag (checking the parent
+    device for partitions). Returns False on other platforms or when unknown.
+    """
+    try:
+        st_dev = os.stat(path).st_dev
+        base = f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+    except (OSError, AttributeError):
+        return False
+    for flag in (f"{base}/queue/rotational", f"{base}/../queue/rotational"):
+        try:
+            with open(flag) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return False
+
+
+InodeKey = Tuple[int, int]  # (device, inode)
+
+
+def _inode_sort_key(path: str, inodes: Optional[Dict[str, Optional[InodeKey]]]) -> Tuple[int, int, int]:
+    """Sort key for ``sort_by_inode``; only paths missing from ``inodes`` are stat'ed."""
+    known = inodes.get(path) if inodes else None
+    if known is not None:
+        return (0, known[0], known[1])
+    try:
+        st = os.stat(path)
+        return (0, st.st_dev, st.st_ino)
+    except OSError:
+        return (1, 0, 0)
+
+
+def sort_by_inode(paths: List[str], inodes: Optional[Dict[str, Optional[InodeKey]]] = None) -> List[str]:
+    """
+    Order paths by (device, inode) so files stored near each other are read together.
+
+    Inode order roughly follows on-disk placement, which turns scattered reads
+    into mostly sequential ones and keeps readahead effective. Paths that cannot
+    be stat'ed keep their relative order at the end. ``inodes`` holds the
+    (device, inode) the scanner already read for each path; only paths not in
+    it are stat'ed again.
+    """
+    return sorted(paths, key=lambda path: _inode_sort_key(path, inodes))
+
+
+def _collapse_inodes(
+    paths: List[str],
+    inodes: Optional[Dict[str, Optional[InodeKey]]] = None
+) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Sort paths by (device, inode) like ``sort_by_inode``, keeping one path per inode.
+
+    Hard links to one inode share their content, so only the first is hashed.
+
+    Returns:
+        The paths to hash in inode order, and a mapping from each of them to
+        its other links.
+    """
+    keyed = sorted(((_inode_sort_key(path, inodes), path) for path in paths), key=lambda item: item[0])
+
+    ordered: List[str] = []
+    aliases: Dict[str, List[str]] = {}
+    previous = None
+    for key, path in keyed:
+        if key[0] == 0 and key == previous:
+            aliases.setdefault(ordered[-1], []).append(path)
+            continue
+        ordered.append(path)
+        previous = key
+    return ordered, aliases
+
+
+def _hash_batch(
+    paths: List[str],
+    buffer_size: Union[int, str],
+    multi_region: bool,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    sizes: Optional[List[Optional[int]]] = None,
+    cache_path: Optional[str] = None
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Hash several files inside a single worker task.
+
+    Errors are returned rather than raised so that one unreadable file does not
+    discard the rest of the batch, and so they can be logged by the parent process.
+    ``sizes``, when given, holds the already known size of each path (or None).
+    With ``cache_path`` set, unchanged files are answered from the worker's
+    hash cache connection and new digests are written back in one
+    transaction per task.
+
+    Returns:
+        A list of (path, digest, error) tuples; exactly one of digest/error is set.
+    """
+    results: List[Tuple[str, Optional[str], Optional[str]]] = []
+    cache = _open_cache(cache_path)
+    if cache is None:
+        for i, path in enumerate(paths):
+            try:
+                size = sizes[i] if sizes is not None else None
+                results.append((path, blake2bsum(path, buffer_size, multi_region, algorithm, size), None))
+            except Exception as e:
+                results.append((path, None, str(e)))
+        return results
+
+    new_entries = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            key = cache.key(st, _cache_mode(st.st_size, buffer_size, multi_region, algorithm))
+            digest = cache.get(key)
+            if digest is None:
+                digest = blake2bsum(path, buffer_size, multi_region, algorithm, st.st_size)
+                if cache.is_stable(st):
+                    new_entries.append((key, digest))
+            results.append((path, digest, None))
+        except Exception as e:
+            results.append((path, None, str(e)))
+    cache.put_many(new_entries)
+    return results
+
+
+def _show_progress_bar() -> bool:
+    """Return True if a tqdm bar would reach a terminal (it draws on stderr)."""
+    try:
+        return sys.stderr is not None and sys.stderr.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def _chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Split a list into consecutive chunks of at most ``size`` items."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _process_context() -> Any:
+    """
+    Return the multiprocessing context for hashing process pools.
+
+    Hashing is often started from a thread (the GUI runs scans on a QThread,
+    and the pipelined pass has a scanner thread), and forking a multithreaded
+    process can copy a lock held by another thread into the child and
+    deadlock it. Workers are therefore started by a fork server where the
+    platform has one, and spawned otherwise, never forked from the caller.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _make_executor(num_files: int, threads: int, use_processes: bool, parallelism: str = "auto") -> Executor:
+    """
+    Create the executor used to hash a batch of files.
+
+    Hashing cache-hot data is CPU-bound and serialised by the GIL, so large
+    batches go to a process pool sized to the number of cores. Small batches
+    and I/O-dominated passes stay on threads. ``parallelism`` overrides the
+    batch size rule for passes that allow processes.
+    """
+    if parallelism not in HASH_PARALLELISM:
+        raise ValueError(f"Unknown hash parallelism: {parallelism}")
+    if use_processes and parallelism != "threads" and (
+            parallelism == "processes" or num_files >= PROCESS_POOL_MIN_FILES):
+        workers = max(1, min(threads, os.cpu_count() or 1))
+        return ProcessPoolExecutor(max_workers=workers, mp_context=_process_context())
+    return ThreadPoolExecutor(max_workers=threads)
 
 
 def batch_hash_files(
@@ -110,61 +724,105 @@ def batch_hash_files(
     multi_region: bool,
     threads: int,
     progress_callback: Optional[Callable[[int], None]] = None,
-    batch_size: Optional[int] = None
+    batch_size: Optional[int] = None,
+    use_processes: bool = True,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    inode_order: bool = False,
+    file_sizes: Optional[Dict[str, int]] = None,
+    cache_path: Optional[str] = None,
+    parallelism: str = "auto",
+    file_inodes: Optional[Dict[str, Optional[InodeKey]]] = None
 ) -> Dict[str, str]:
     """
     Hashes a batch of files in parallel with optimized batching and progress reporting.
 
+    Files are grouped into chunks and each chunk is hashed by a single worker
+    task, which amortises scheduling and result-handling overhead on trees
+    with many small files.
+
     Args:
         paths: A list of file paths to hash.
         buffer_size: The buffer size to use for hashing.
         multi_region: Whether to use multi-region hashing.
         threads: The number of threads to use.
         progress_callback: An optional callback to report progress percentage.
-        batch_size: Size of batches for processing (None for auto-detect).
+        batch_size: Number of files per worker task (None for auto-detect).
+        use_processes: Hash in a process pool (capped at the CPU count) when the
+                       batch is large enough; otherwise use a thread pool.
+        algorithm: Hash algorithm to use (see HASH_ALGORITHMS).
+        inode_order: Submit files sorted by (device, inode) to reduce seeking;
+                     hard links found this way are hashed once.
+        file_sizes: Known size of each path, so workers skip the stat call.
+        cache_path: SQLite hash cache to consult and update (None to disable).
+        parallelism: One of HASH_PARALLELISM; 'threads' or 'processes' replace
+                     the batch size rule when ``use_processes`` is set.
+        file_inodes: Known (device, inode) of each path, so ``inode_order``
+                     does not stat it again.
 
     Returns:
         A dictionary mapping file paths to their hashes.
     """
     if not paths:
         return {}
+
+    # A path listed twice is hashed once
+    paths = list(dict.fromkeys(paths))
+    aliases: Dict[str, List[str]] = {}
+    if inode_order:
+        paths, aliases = _collapse_inodes(paths, file_inodes)
     
-    # Auto-determine optimal batch size
+    # Auto-determine batch size: roughly four tasks per worker
     if batch_size is None:
-        batch_size = max(1, min(100, len(paths) // (threads * 2)))
+        batch_size = max(1, min(MAX_HASH_BATCH_SIZE, len(paths) // (threads * 4)))
     
     results = {}
+    total = len(paths)
     last_percent = -1
     
-    # Process files in batches for better memory management
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        # Submit all tasks
-        futures = {executor.submit(blake2bsum, p, buffer_size, multi_region): p for p in paths}
+    with _make_executor(total, threads, use_processes, parallelism) as executor:
+        # Arguments are plain str/int/bool so they pickle cheaply
+        futures = [executor.submit(_hash_batch, chunk, buffer_size, multi_region, algorithm,
+                                   [file_sizes.get(p) for p in chunk] if file_sizes else None,
+                                   cache_path)
+                   for chunk in _chunked(paths, batch_size)]
         
-        # Process results with optimized progress reporting
-        with tqdm(total=len(futures), desc="Hashing files", disable=(sys.stdout is None or progress_callback is not None)) as pbar:
+        # Process results with optimized progress reporting; without a terminal
+        # (GUI, redirected output) tqdm would only add locking and formatting
+        show_bar = progress_callback is None and _show_progress_bar()
+        with (tqdm(total=total, desc="Hashing files", miniters=max(1, total // 200), mininterval=0.2)
+              if show_bar else nullcontext()) as pbar:
             completed = 0
             for future in as_completed(futures):
-                path = futures[future]
                 try:
-                    results[path] = future.result()
-                except (OSError, Exception) as e:
-                    logger.error(f"Could not process {path}: {e}")
-                finally:
-                    completed += 1
-                    pbar.update(1)
-                    
-                    # Optimized progress callback (less frequent updates)
-                    if progress_callback and completed % max(1, len(futures) // 20) == 0:
-                        percent = int((completed / len(futures)) * 100)
-                        if percent > last_percent:
-                            progress_callback(percent)
-                            last_percent = percent
+                    batch = future.result()
+                except Exception as e:
+                    logger.error(f"Hashing task failed: {e}")
+                    continue
+                for path, digest, error in batch:
+                    if error is None:
+                        results[path] = digest
+                    else:
+                        logger.error(f"Could not process {path}: {error}")
+                completed += len(batch)
+                if pbar is not None:
+                    pbar.update(len(batch))
+                
+                # Optimized progress callback (less frequent updates)
+                if progress_callback:
+                    percent = int((completed / total) * 100)
+                    if percent >= last_percent + 5:
+                        progress_callback(percent)
+                        last_percent = percent
+    _close_worker_caches()
     
     # Final progress update
     if progress_callback and last_percent < 100:
         progress_callback(100)
-    
+
+    for path, links in aliases.items():
+        if path in results:
+            results.update(dict.fromkeys(links, results[path]))
+
     return results
 
 
@@ -173,7 +831,9 @@ def hash_files_with_size_info(
     buffer_size: Union[int, str],
     multi_region: bool,
     threads: int,
-    progress_callback: Optional[Callable[[int], None]] = None
+    progress_callback: Optional[Callable[[int], None]] = None,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    cache_path: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Hash files with pre-computed size information for better performance.
@@ -187,6 +847,8 @@ def hash_files_with_size_info(
         multi_region: Whether to use multi-region hashing.
         threads: The number of threads to use.
         progress_callback: An optional callback to report progress percentage.
+        algorithm: Hash algorithm to use (see HASH_ALGORITHMS).
+        cache_path: SQLite hash cache to consult and update (None to disable).
         
     Returns:
         A dictionary mapping file paths to their hashes.
@@ -200,4 +862,168 @@ def hash_files_with_size_info(
     # Extract just the paths for hashing
     paths = [path for _, path in files_with_size]
     
-    return batch_hash_files(paths, buffer_size, multi_region, threads, progress_callback)
+    return batch_hash_files(paths, buffer_size, multi_region, threads, progress_callback,
+                            algorithm=algorithm,
+                            file_sizes={path: size for size, path in files_with_size},
+                            cache_path=cache_path)
+
+
+def hash_files_pipelined(
+    files_with_size: Iterable[Tuple[int, str]],
+    buffer_size: Union[int, str],
+    multi_region: bool,
+    threads: int,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    scan_callback: Optional[Callable[[int], None]] = None,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    min_group_size: int = 2,
+    cache_path: Optional[str] = None,
+    inodes: Optional[Dict[str, Optional[InodeKey]]] = None,
+    parallelism: str = "auto"
+) -> Tuple[Dict[int, List[str]], Dict[str, str]]:
+    """
+    Hash files while they are still being discovered.
+
+    The scanner iterator runs in a background thread and feeds a bounded queue.
+    The calling thread groups files by size and, as soon as a size bucket has a
+    second member, submits its files for hashing, so the disk and CPU are busy
+    during the scan instead of idling until it finishes. Files whose size stays
+    unique are never hashed, and are only held as the scanner's tuple (no list)
+    while the scan runs. Each batch is submitted in inode order; when the scanner
+    yields (size, path, inode) tuples that order costs no extra stat.
+
+    Args:
+        files_with_size: Iterable of (size, path) or (size, path, inode) tuples,
+                         typically a scanner generator.
+        buffer_size: The buffer size to use for hashing.
+        multi_region: Whether to use multi-region hashing.
+        threads: The number of threads to use.
+        progress_callback: An optional callback to report hashing progress percentage;
+                           it starts once the scan is complete and the total is known.
+        scan_callback: An optional callback receiving the number of files scanned,
+                       called once when the scan finishes.
+        algorithm: Hash algorithm to use (see HASH_ALGORITHMS).
+        min_group_size: Only hash files whose size is shared by at least this many
+                        files; smaller groups are returned without hashes.
+        cache_path: SQLite hash cache to consult and update (None to disable).
+        inodes: Dictionary to fill with the (device, inode) of every file in a
+                returned group, when the scanner supplied it.
+        parallelism: One of HASH_PARALLELISM; 'processes' hashes in a process
+                     pool, 'auto' and 'threads' use a thread pool.
+
+    Returns:
+        A tuple of (sizes shared by two or more files mapped to those files,
+        mapping of hashed paths to their hashes).
+    """
+    done = object()
+    # Files cross the queue in chunks, so the lock and wake-up cost of a queue
+    # operation, and the poll for finished tasks, are paid per chunk, not per file
+    items: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, PIPELINE_QUEUE_SIZE // PIPELINE_CHUNK_SIZE))
+    scan_errors: List[BaseException] = []
+
+    def produce() -> None:
+        try:
+            it = iter(files_with_size)
+            while chunk := list(islice(it, PIPELINE_CHUNK_SIZE)):
+                items.put(chunk)
+        except BaseException as e:
+            scan_errors.append(e)
+        finally:
+            items.put(done)
+
+    # Most sizes occur once: keep the scanner's tuple for those and only
+    # allocate a list when a second file of the same size turns up
+    first_seen: Dict[int, Tuple[Any, ...]] = {}
+    if inodes is None:
+        inodes = {}
+    groups: Dict[int, List[str]] = {}
+    results: Dict[str, str] = {}
+    pending: Set[Future] = set()
+    ready: List[Tuple[int, str]] = []
+    submitted = 0
+    completed = 0
+
+    def collect(finished: Iterable[Future]) -> None:
+        nonlocal completed
+        for future in finished:
+            try:
+                batch = future.result()
+            except Exception as e:
+                logger.error(f"Hashing task failed: {e}")
+                continue
+            for path, digest, error in batch:
+                if error is None:
+                    results[path] = digest
+                else:
+                    logger.error(f"Could not process {path}: {error}")
+            completed += len(batch)
+
+    producer = threading.Thread(target=produce, name="duplicatemaster-scan", daemon=True)
+    producer.start()
+    scanned = 0
+
+    # Hashing from a cold disk overlaps with the scan, so threads are enough
+    # here unless processes are asked for; the total is not known in advance
+    with _make_executor(0, threads, True, parallelism) as executor:
+        scanning = True
+        while scanning:
+            chunk = items.get()
+            if chunk is done:
+                scanning = False
+            else:
+                scanned += len(chunk)
+                for item in chunk:
+                    size, path = item[0], item[1]
+                    group = groups.get(size)
+                    if group is not None:
+                        group.append(path)
+                    elif size in first_seen:
+                        first = first_seen.pop(size)
+                        group = groups[size] = [first[1], path]
+                        if len(first) > 2:
+                            inodes[first[1]] = first[2]
+                    else:
+                        first_seen[size] = item
+                        continue
+                    if len(item) > 2:
+                        inodes[path] = item[2]
+                    if len(group) == min_group_size:
+                        ready.extend((size, p) for p in group)
+                    elif len(group) > min_group_size:
+                        ready.append((size, path))
+
+            # Flush when a batch is full, or when the scanner is behind and workers would idle
+            if ready and (len(ready) >= PIPELINE_BATCH_SIZE or not scanning or items.empty()):
+                for batch in _chunked(ready, PIPELINE_BATCH_SIZE):
+                    sizes = dict((p, s) for s, p in batch)
+                    paths = sort_by_inode(list(sizes), inodes)
+                    pending.add(executor.submit(_hash_batch, paths, buffer_size, multi_region,
+                                                algorithm, [sizes[p] for p in paths], cache_path))
+                submitted += len(ready)
+                ready = []
+
+            if pending:
+                finished, pending = wait(pending, timeout=0, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+        producer.join()
+        if scan_errors:
+            raise scan_errors[0]
+        if scan_callback:
+            scan_callback(scanned)
+
+        last_percent = -1
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(finished)
+            if progress_callback and submitted:
+                percent = int((completed / submitted) * 100)
+                if percent >= last_percent + 5:
+                    progress_callback(percent)
+                    last_percent = percent
+    _close_worker_caches()
+
+    if progress_callback and last_percent < 100:
+        progress_callback(100)
+
+    return groups, results
@@ -36,6 +36,9 @@ def setup_logger(args: Any) -> logging.Logger:
         - If no logfile and no stdout (GUI mode), uses NullHandler
         - Log format: [LEVEL]    message
         - Prevents duplicate handlers if called multiple times
+        - In per-file or per-group loops, pass values as arguments
+          (``logger.info("Deleted: %s", path)``) so nothing is formatted when
+          the level is disabled
     """
     logger = logging.getLogger("duplicatemaster")
     logger.setLevel(logging.getLevelName(args.loglevel.upper()))
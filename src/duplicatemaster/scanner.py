@@ -1,9 +1,71 @@
 import os
+import re
+import logging
+import stat
 import fnmatch
-from typing import List, Iterator, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, FrozenSet, Iterable, List, Iterator, Any, Optional, Pattern, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-import threading
+
+
+def _compile_exclude(patterns: List[str]) -> Optional[Pattern[str]]:
+    """
+    Combine glob patterns into one compiled regex, or None if there are none.
+
+    ``fnmatch.fnmatch`` translates (or looks up) each pattern on every call;
+    matching a file name once against a single precompiled union is cheaper.
+    Matching is case-insensitive where the platform's ``fnmatch`` is.
+    """
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.path.normcase("A") != "A" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), flags)
+
+
+def _debug_enabled(logger: Any) -> bool:
+    """
+    Return True if ``logger`` would emit DEBUG records.
+
+    Per-entry debug messages are guarded with this so their f-strings are not
+    built for every file when debug output is off. Loggers without
+    ``isEnabledFor`` are assumed to want everything.
+    """
+    is_enabled = getattr(logger, "isEnabledFor", None)
+    return is_enabled is None or is_enabled(logging.DEBUG)
+
+
+def _inode_key(st: os.stat_result) -> Optional[Tuple[int, int]]:
+    """Return (device, inode) from a stat result, or None if the platform reports no inode."""
+    # Windows directory entries report st_ino (and st_nlink) as 0
+    if st.st_ino:
+        return (st.st_dev, st.st_ino)
+    return None
+
+
+def _collapse_hardlinks(
+    files: Iterable[Tuple[int, str, Optional[Tuple[int, int]], int]],
+    hardlinks: Optional[Dict[str, List[str]]],
+    logger: Any,
+    with_inode: bool = False
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield (size, path) once per inode, recording further links as aliases.
+
+    Paths that are hard links to an inode already yielded share its content,
+    so they are not yielded again; ``hardlinks`` maps the first path seen for
+    the inode to its other paths. With ``hardlinks`` None every path is yielded.
+    With ``with_inode`` set, (size, path, inode) tuples are yielded instead.
+    """
+    first_link: Dict[Tuple[int, int], str] = {}
+    for size, path, inode, nlink in files:
+        if nlink > 1 and inode is not None and hardlinks is not None:
+            first = first_link.get(inode)
+            if first is not None:
+                logger.debug(f"Hard link to {first}: {path}")
+                hardlinks.setdefault(first, []).append(path)
+                continue
+            first_link[inode] = path
+        yield (size, path, inode) if with_inode else (size, path)
 
 
 def get_files_recursively(
@@ -12,8 +74,9 @@ def get_files_recursively(
     exclude_dir: List[str],
     exclude_hidden: bool,
     logger: Any,
-    max_workers: Optional[int] = None
-) -> Iterator[str]:
+    max_workers: Optional[int] = None,
+    yield_size: bool = False
+) -> Iterator[Union[str, Tuple[int, str]]]:
     """
     Recursively scan a directory and yield file paths that match the criteria.
 
@@ -28,9 +91,13 @@ def get_files_recursively(
         exclude_hidden: If True, skip files and directories that start with '.'.
         logger: Logger instance for recording scan progress and errors.
         max_workers: Number of threads for parallel scanning (None for auto-detect).
+        yield_size: If True, yield (size, path) tuples instead of paths. The size
+                    comes from the stat already cached on the directory entry,
+                    so callers do not need to stat the file again.
 
     Yields:
-        str: Path to each file that passes all exclusion filters.
+        str: Path to each file that passes all exclusion filters, or a
+        (file_size, file_path) tuple when ``yield_size`` is set.
 
     Examples:
         >>> for file_path in get_files_recursively('/home/user', ['*.tmp'], ['.git'], True, logger):
@@ -43,53 +110,238 @@ def get_files_recursively(
     
     # Use parallel scanning for better performance
     if max_workers > 1:
-        yield from _get_files_parallel(base_dir, exclude, exclude_dir, exclude_hidden, logger, max_workers)
+        yield from _get_files_parallel(base_dir, exclude, exclude_dir, exclude_hidden, logger, max_workers, yield_size)
     else:
-        yield from _get_files_sequential(base_dir, exclude, exclude_dir, exclude_hidden, logger)
+        yield from _get_files_sequential(base_dir, exclude, exclude_dir, exclude_hidden, logger, yield_size)
 
 
 def _get_files_sequential(
+    base_dir: str,
+    exclude: List[str],
+    exclude_dir: List[str],
+    exclude_hidden: bool,
+    logger: Any,
+    yield_size: bool = False
+) -> Iterator[Union[str, Tuple[int, str]]]:
+    """Sequential file discovery, walking with ``os.fwalk`` where the platform supports it."""
+    if hasattr(os, "fwalk"):
+        for size, path, _, _ in _fwalk_files(base_dir, exclude, exclude_dir, exclude_hidden, logger):
+            yield (size, path) if yield_size else path
+    else:
+        yield from _scandir_files(base_dir, _compile_exclude(exclude), frozenset(exclude_dir),
+                                  exclude_hidden, logger, yield_size)
+
+
+def _fwalk_files(
     base_dir: str,
     exclude: List[str],
     exclude_dir: List[str],
     exclude_hidden: bool,
     logger: Any
-) -> Iterator[str]:
-    """Sequential file discovery (original implementation)."""
+) -> Iterator[Tuple[int, str, Optional[Tuple[int, int]], int]]:
+    """
+    Walk a directory tree with ``os.fwalk`` and yield (size, path, inode, nlink) tuples.
+
+    Every entry is stat'ed relative to its parent directory's file descriptor,
+    so the kernel never re-resolves the full path, and the size, (device,
+    inode) and link count come from the same ``lstat`` used to detect
+    symlinks. Not available on Windows.
+    """
+    if not os.path.isdir(base_dir):
+        logger.warning(f"Skipping non-directory path: {base_dir}")
+        return
+
+    exclude_re = _compile_exclude(exclude)
+    exclude_dirs = frozenset(exclude_dir)
+    debug = _debug_enabled(logger)
+
+    def on_error(e: OSError) -> None:
+        logger.warning(f"Cannot scan directory: {e.filename} ({e})")
+
+    # Walk "." relative to an fd opened on base_dir, so a symlinked base
+    # directory is still scanned while symlinks below it are not followed
     try:
-        if not os.path.isdir(base_dir):
-            logger.warning(f"Skipping non-directory path: {base_dir}")
-            return
+        base_fd = os.open(base_dir, os.O_RDONLY)
+    except OSError as e:
+        logger.warning(f"Cannot scan directory: {base_dir} ({e})")
+        return
 
-        try:
-            entries = list(os.scandir(base_dir))
-        except Exception as e:
-            logger.warning(f"Cannot scan directory: {base_dir} ({e})")
-            return
+    try:
+        for dirpath, dirnames, filenames, dirfd in os.fwalk(
+                ".", onerror=on_error, follow_symlinks=False, dir_fd=base_fd):
+            root = base_dir if dirpath == "." else os.path.join(base_dir, dirpath[2:])
 
-        for entry in entries:
-            try:
-                path = entry.path
-                if entry.is_symlink():
-                    logger.debug(f"Skipping symlink: {path}")
+            # Directory entry names are never empty, so name[0] is safe and
+            # cheaper than a startswith() method call
+            kept = []
+            for name in dirnames:
+                if exclude_hidden and name[0] == '.':
                     continue
-                if exclude_hidden and entry.name.startswith('.'):
+                if name in exclude_dirs:
+                    if debug:
+                        logger.debug(f"Excluded directory: {os.path.join(root, name)}")
                     continue
-                if entry.is_dir(follow_symlinks=False):
-                    if entry.name in exclude_dir:
-                        logger.debug(f"Excluded directory: {path}")
-                        continue
-                    yield from _get_files_sequential(path, exclude, exclude_dir, exclude_hidden, logger)
-                else:
-                    if any(fnmatch.fnmatch(entry.name, pattern) for pattern in exclude):
+                kept.append(name)
+            # Pruning in place stops fwalk from descending into excluded directories
+            dirnames[:] = kept
+
+            for name in filenames:
+                path = os.path.join(root, name)
+                if exclude_hidden and name[0] == '.':
+                    continue
+                if exclude_re and exclude_re.match(name):
+                    if debug:
                         logger.debug(f"Excluded file: {path}")
-                        continue
+                    continue
+                try:
+                    st = os.stat(name, dir_fd=dirfd, follow_symlinks=False)
+                except OSError as e:
+                    logger.warning(f"Skipping entry: {path} ({e})")
+                    continue
+                if stat.S_ISLNK(st.st_mode):
+                    if debug:
+                        logger.debug(f"Skipping symlink: {path}")
+                    continue
+                if debug:
                     logger.debug(f"Found file: {path}")
-                    yield path
-            except Exception as e:
-                logger.warning(f"Skipping entry (inner): {entry} ({e})")
+                yield st.st_size, path, _inode_key(st), st.st_nlink
+    finally:
+        os.close(base_fd)
+
+
+def _scan_directory(
+    dir_path: str,
+    exclude_re: Optional[Pattern[str]],
+    exclude_dirs: FrozenSet[str],
+    exclude_hidden: bool,
+    logger: Any,
+    yield_size: bool = False,
+    size_range: Optional[Tuple[int, int]] = None,
+    link_keys: bool = False
+) -> Tuple[List[Any], List[str]]:
+    """
+    Scan one directory level, without descending into subdirectories.
+
+    Args:
+        dir_path: Directory to list.
+        exclude_re: Compiled exclude pattern for file names (None for no exclusions).
+        exclude_dirs: Directory names to skip.
+        exclude_hidden: If True, skip entries that start with '.'.
+        logger: Logger instance for recording scan progress and errors.
+        yield_size: Return (size, path) tuples instead of paths.
+        size_range: Inclusive (min_size, max_size) filter; implies ``yield_size``.
+        link_keys: Return (size, path, inode, nlink) tuples, where inode is the
+                   file's (device, inode), or None where the platform has none.
+
+    Returns:
+        A tuple of (matching files, subdirectories still to scan).
+    """
+    files: List[Any] = []
+    subdirs: List[str] = []
+    try:
+        entries = list(os.scandir(dir_path))
     except Exception as e:
-        logger.warning(f"Top-level error scanning {base_dir}: {e}")
+        logger.warning(f"Cannot scan directory: {dir_path} ({e})")
+        return files, subdirs
+
+    debug = _debug_enabled(logger)
+    for entry in entries:
+        try:
+            path = entry.path
+            if entry.is_symlink():
+                if debug:
+                    logger.debug(f"Skipping symlink: {path}")
+                continue
+            if exclude_hidden and entry.name[0] == '.':  # Names are never empty
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in exclude_dirs:
+                    if debug:
+                        logger.debug(f"Excluded directory: {path}")
+                    continue
+                subdirs.append(path)
+                continue
+            if exclude_re and exclude_re.match(entry.name):
+                if debug:
+                    logger.debug(f"Excluded file: {path}")
+                continue
+            if not yield_size and size_range is None and not link_keys:
+                if debug:
+                    logger.debug(f"Found file: {path}")
+                files.append(path)
+                continue
+            # DirEntry caches its stat, so this is usually free
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                if debug:
+                    logger.debug(f"Cannot get size for: {path}")
+                continue
+            size = st.st_size
+            if size_range is None or size_range[0] <= size <= size_range[1]:
+                if debug:
+                    logger.debug(f"Found file: {path} ({size} bytes)")
+                files.append((size, path, _inode_key(st), st.st_nlink) if link_keys else (size, path))
+        except Exception as e:
+            logger.warning(f"Skipping entry: {entry} ({e})")
+    return files, subdirs
+
+
+def _scandir_files(
+    base_dir: str,
+    exclude_re: Optional[Pattern[str]],
+    exclude_dirs: FrozenSet[str],
+    exclude_hidden: bool,
+    logger: Any,
+    yield_size: bool = False
+) -> Iterator[Union[str, Tuple[int, str]]]:
+    """
+    Depth-first ``os.scandir`` discovery, used where ``os.fwalk`` is unavailable.
+
+    Directories wait on an explicit stack rather than in nested generator
+    frames, so deep trees cannot hit the recursion limit.
+    """
+    if not os.path.isdir(base_dir):
+        logger.warning(f"Skipping non-directory path: {base_dir}")
+        return
+
+    stack = [base_dir]
+    while stack:
+        files, subdirs = _scan_directory(stack.pop(), exclude_re, exclude_dirs,
+                                         exclude_hidden, logger, yield_size)
+        yield from files
+        # Reversed, so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
+def _walk_parallel(
+    base_dir: str,
+    scan: Callable[[str], Tuple[List[Any], List[str]]],
+    logger: Any,
+    max_workers: int
+) -> Iterator[Any]:
+    """
+    Scan a directory tree with one thread pool, one directory per task.
+
+    Subdirectories found by a task are submitted to the same pool, and each
+    directory's files are yielded as soon as its task finishes, so consumers
+    start working before the whole tree has been listed.
+    """
+    if not os.path.isdir(base_dir):
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(scan, base_dir)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    files, subdirs = future.result()
+                except Exception as e:
+                    logger.warning(f"Error scanning subdirectory: {e}")
+                    continue
+                pending.update(executor.submit(scan, subdir) for subdir in subdirs)
+                yield from files
 
 
 def _get_files_parallel(
@@ -98,72 +350,17 @@ def _get_files_parallel(
     exclude_dir: List[str],
     exclude_hidden: bool,
     logger: Any,
-    max_workers: int
-) -> Iterator[str]:
+    max_workers: int,
+    yield_size: bool = False
+) -> Iterator[Union[str, Tuple[int, str]]]:
     """Parallel file discovery using multiple threads."""
-    discovered_files = set()
-    lock = threading.Lock()
-    
-    def scan_directory(dir_path: str) -> List[str]:
-        """Scan a single directory and return file paths."""
-        files = []
-        try:
-            if not os.path.isdir(dir_path):
-                return files
+    exclude_re = _compile_exclude(exclude)
+    exclude_dirs = frozenset(exclude_dir)
 
-            try:
-                entries = list(os.scandir(dir_path))
-            except Exception as e:
-                logger.warning(f"Cannot scan directory: {dir_path} ({e})")
-                return files
+    def scan(dir_path: str) -> Tuple[List[Union[str, Tuple[int, str]]], List[str]]:
+        return _scan_directory(dir_path, exclude_re, exclude_dirs, exclude_hidden, logger, yield_size)
 
-            subdirs = []
-            for entry in entries:
-                try:
-                    path = entry.path
-                    if entry.is_symlink():
-                        logger.debug(f"Skipping symlink: {path}")
-                        continue
-                    if exclude_hidden and entry.name.startswith('.'):
-                        continue
-                    if entry.is_dir(follow_symlinks=False):
-                        if entry.name in exclude_dir:
-                            logger.debug(f"Excluded directory: {path}")
-                            continue
-                        subdirs.append(path)
-                    else:
-                        if any(fnmatch.fnmatch(entry.name, pattern) for pattern in exclude):
-                            logger.debug(f"Excluded file: {path}")
-                            continue
-                        logger.debug(f"Found file: {path}")
-                        files.append(path)
-                except Exception as e:
-                    logger.warning(f"Skipping entry: {entry} ({e})")
-            
-            # Recursively scan subdirectories
-            if subdirs:
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_dir = {executor.submit(scan_directory, subdir): subdir for subdir in subdirs}
-                    for future in as_completed(future_to_dir):
-                        try:
-                            files.extend(future.result())
-                        except Exception as e:
-                            logger.warning(f"Error scanning subdirectory: {e}")
-                            
-        except Exception as e:
-            logger.warning(f"Error scanning directory {dir_path}: {e}")
-        
-        return files
-    
-    # Start parallel scanning
-    all_files = scan_directory(base_dir)
-    
-    # Yield files while avoiding duplicates
-    for file_path in all_files:
-        with lock:
-            if file_path not in discovered_files:
-                discovered_files.add(file_path)
-                yield file_path
+    yield from _walk_parallel(base_dir, scan, logger, max_workers)
 
 
 def get_files_with_size_filter(
@@ -174,13 +371,19 @@ def get_files_with_size_filter(
     min_size: int,
     max_size: int,
     logger: Any,
-    max_workers: Optional[int] = None
-) -> Iterator[tuple[int, str]]:
+    max_workers: Optional[int] = None,
+    hardlinks: Optional[Dict[str, List[str]]] = None,
+    with_inode: bool = False
+) -> Iterator[Tuple[Any, ...]]:
     """
     Recursively scan a directory and yield (size, path) tuples with early size filtering.
     
     This optimized version filters files by size during the discovery phase,
     reducing the number of files that need to be processed in later stages.
+    When ``hardlinks`` is given, only the first path found for each inode is
+    yielded; the other hard links to it are recorded in ``hardlinks`` instead.
+    With ``with_inode`` set, each file's (device, inode) from the same stat is
+    yielded too, so consumers can order reads by inode without a second stat.
     
     Args:
         base_dir: The root directory to start scanning from.
@@ -191,76 +394,33 @@ def get_files_with_size_filter(
         max_size: Maximum file size in bytes.
         logger: Logger instance for recording scan progress and errors.
         max_workers: Number of threads for parallel scanning.
+        hardlinks: Dictionary to fill with {first path: [other hard links]}
+                   (None to yield every path).
+        with_inode: Yield (file_size, file_path, inode) tuples, where inode is
+                    (device, inode) or None where the platform reports none.
         
     Yields:
         tuple[int, str]: (file_size, file_path) for files that pass all filters.
     """
     if max_workers is None:
         max_workers = min(32, (os.cpu_count() or 1) + 4)
-    
-    def scan_with_size_filter(dir_path: str) -> List[tuple[int, str]]:
-        """Scan a single directory and return (size, path) tuples."""
-        files = []
-        try:
-            if not os.path.isdir(dir_path):
-                return files
 
-            try:
-                entries = list(os.scandir(dir_path))
-            except Exception as e:
-                logger.warning(f"Cannot scan directory: {dir_path} ({e})")
-                return files
+    # A single worker gains nothing from thread pools; walk sequentially and
+    # take the size from the walker's own stat
+    if max_workers <= 1 and hasattr(os, "fwalk"):
+        files: Iterable[Tuple[int, str, Optional[Tuple[int, int]], int]] = (
+            entry for entry in _fwalk_files(base_dir, exclude, exclude_dir, exclude_hidden, logger)
+            if min_size <= entry[0] <= max_size
+        )
+    else:
+        exclude_re = _compile_exclude(exclude)
+        exclude_dirs = frozenset(exclude_dir)
 
-            subdirs = []
-            for entry in entries:
-                try:
-                    path = entry.path
-                    if entry.is_symlink():
-                        logger.debug(f"Skipping symlink: {path}")
-                        continue
-                    if exclude_hidden and entry.name.startswith('.'):
-                        continue
-                    if entry.is_dir(follow_symlinks=False):
-                        if entry.name in exclude_dir:
-                            logger.debug(f"Excluded directory: {path}")
-                            continue
-                        subdirs.append(path)
-                    else:
-                        if any(fnmatch.fnmatch(entry.name, pattern) for pattern in exclude):
-                            logger.debug(f"Excluded file: {path}")
-                            continue
-                        
-                        # Early size filtering
-                        try:
-                            size = entry.stat().st_size
-                            if min_size <= size <= max_size:
-                                logger.debug(f"Found file: {path} ({size} bytes)")
-                                files.append((size, path))
-                        except OSError:
-                            logger.debug(f"Cannot get size for: {path}")
-                            continue
-                            
-                except Exception as e:
-                    logger.warning(f"Skipping entry: {entry} ({e})")
-            
-            # Recursively scan subdirectories
-            if subdirs:
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_dir = {executor.submit(scan_with_size_filter, subdir): subdir for subdir in subdirs}
-                    for future in as_completed(future_to_dir):
-                        try:
-                            files.extend(future.result())
-                        except Exception as e:
-                            logger.warning(f"Error scanning subdirectory: {e}")
-                            
-        except Exception as e:
-            logger.warning(f"Error scanning directory {dir_path}: {e}")
-        
-        return files
-    
-    # Start parallel scanning with size filtering
-    all_files = scan_with_size_filter(base_dir)
-    
-    # Yield files (already filtered by size)
-    for size, file_path in all_files:
-        yield (size, file_path)
+        def scan(dir_path: str) -> Tuple[List[Any], List[str]]:
+            return _scan_directory(dir_path, exclude_re, exclude_dirs, exclude_hidden, logger,
+                                   size_range=(min_size, max_size), link_keys=True)
+
+        # Files are yielded per directory as they are found, already filtered by size
+        files = _walk_parallel(base_dir, scan, logger, max_workers)
+
+    yield from _collapse_hardlinks(files, hardlinks, logger, with_inode)
@@ -3,28 +3,138 @@ from duplicatemaster.logger import setup_logger
 from duplicatemaster.analyzer import analyze_space_savings, format_bytes
 from duplicatemaster.deduper import find_duplicates
 from duplicatemaster.deletion import delete_files
+from duplicatemaster.hashcache import DEFAULT_CACHE_PATH
 from PySide6.QtGui import QIcon, QFont, QColor, QBrush
-from PySide6.QtCore import Qt, QThread, Signal, QObject, QTimer
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QObject, QTimer, QAbstractTableModel, QModelIndex,
+    QSortFilterProxyModel
+)
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton,
-    QLabel, QFileDialog, QTableWidget, QTableWidgetItem, QHBoxLayout, QTextEdit,
+    QLabel, QFileDialog, QTableView, QHBoxLayout, QTextEdit,
     QCheckBox, QRadioButton, QButtonGroup, QGroupBox, QMessageBox,
     QLineEdit, QSpinBox, QAbstractItemView, QProgressBar
 )
 import sys
 import os
+import multiprocessing
 from typing import Dict, List, Tuple, Any, Optional, Union
 
 
-class SortableItem(QTableWidgetItem):
-    def __init__(self, display_text, sort_value):
-        super().__init__(display_text)
-        self.sort_value = sort_value
-
-    def __lt__(self, other):
-        if isinstance(other, SortableItem):
-            return self.sort_value < other.sort_value
-        return super().__lt__(other)
+class DuplicateTableModel(QAbstractTableModel):
+    """Table model over parallel per-column lists of duplicate results.
+
+    Rows are built once per scan and swapped in with a model reset, and
+    sorting reorders the lists in place, so populating and sorting large
+    result sets avoids creating a widget item per cell.
+    """
+
+    HEADERS = ("Group", "Size", "Hash", "Path")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.group_ids: List[int] = []
+        self.sizes: List[int] = []
+        self.hashes: List[str] = []
+        self.paths: List[str] = []
+        self.lower_paths: List[str] = []
+
+    def set_duplicates(self, duplicates: Dict[Tuple[int, str], List[str]]):
+        group_ids: List[int] = []
+        sizes: List[int] = []
+        hashes: List[str] = []
+        paths: List[str] = []
+        for group_id, ((size, hash_val), group_paths) in enumerate(
+                sorted(duplicates.items()), start=1):
+            count = len(group_paths)
+            group_ids.extend([group_id] * count)
+            sizes.extend([size] * count)
+            hashes.extend([hash_val] * count)
+            paths.extend(group_paths)
+
+        self.beginResetModel()
+        self.group_ids, self.sizes, self.hashes, self.paths = (
+            group_ids, sizes, hashes, paths)
+        self.lower_paths = [path.lower() for path in paths]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal
+                and role == Qt.ItemDataRole.DisplayRole):
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(self.group_ids[row])
+            if column == 1:
+                return format_bytes(self.sizes[row])
+            if column == 2:
+                hash_val = self.hashes[row]
+                return f"{hash_val[:8]}...{hash_val[-8:]}"
+            return self.paths[row]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if column == 2:
+                return self.hashes[row]
+            if column == 3:
+                return str(self.sizes[row])
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self.HEADERS):
+            return
+        keys = (self.group_ids, self.sizes, self.hashes, self.paths)[column]
+        new_order = sorted(range(len(keys)), key=keys.__getitem__,
+                           reverse=order == Qt.SortOrder.DescendingOrder)
+
+        self.layoutAboutToBeChanged.emit()
+        new_rows = [0] * len(new_order)
+        for new_row, old_row in enumerate(new_order):
+            new_rows[old_row] = new_row
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [
+            self.index(new_rows[index.row()], index.column())
+            for index in old_indexes])
+        self.group_ids = [self.group_ids[i] for i in new_order]
+        self.sizes = [self.sizes[i] for i in new_order]
+        self.hashes = [self.hashes[i] for i in new_order]
+        self.paths = [self.paths[i] for i in new_order]
+        self.lower_paths = [self.lower_paths[i] for i in new_order]
+        self.layoutChanged.emit()
+
+
+class DuplicateFilterProxyModel(QSortFilterProxyModel):
+    """Path filter proxy that reads the source model's lists directly.
+
+    Sorting is delegated to the source model, which reorders its lists.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.keyword = ""
+
+    def set_keyword(self, keyword: str):
+        keyword = keyword.lower()
+        if keyword != self.keyword:
+            self.keyword = keyword
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return (not self.keyword
+                or self.keyword in self.sourceModel().lower_paths[source_row])
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
 
 
 class ScanWorker(QObject):
@@ -72,7 +182,8 @@ class ScanWorker(QObject):
                 exclude_hidden=self.options['exclude_hidden'],
                 threads=os.cpu_count() or 1,
                 logger=logger_proxy,
-                progress_callback=self.progress.emit
+                progress_callback=self.progress.emit,
+                hash_cache=self.options.get('hash_cache')
             )
             log_msg(
                 f"✅ Scan complete. Found {len(duplicates)} duplicate groups.")
@@ -189,9 +300,11 @@ class MainWindow(QMainWindow):
         self.logger_output.setReadOnly(True)
 
         self.folder_label = QLabel("No folder selected")
-        self.result_table = QTableWidget(0, 4)
-        self.result_table.setHorizontalHeaderLabels([
-            "Group", "Size", "Hash", "Path"])
+        self.result_model = DuplicateTableModel(self)
+        self.result_proxy = DuplicateFilterProxyModel(self)
+        self.result_proxy.setSourceModel(self.result_model)
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_proxy)
         self.result_table.horizontalHeader().setStretchLastSection(True)
         self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.result_table.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
@@ -205,7 +318,13 @@ class MainWindow(QMainWindow):
 
         self.filter_input = QLineEdit()
         self.filter_input.setPlaceholderText("Filter by file path...")
-        self.filter_input.textChanged.connect(self.apply_filter)
+        # Coalesce keystrokes so the filter runs once typing pauses
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(100)
+        self.filter_timer.timeout.connect(
+            lambda: self.result_proxy.set_keyword(self.filter_input.text()))
+        self.filter_input.textChanged.connect(lambda _: self.filter_timer.start())
 
         self.min_size_input = QSpinBox()
         self.min_size_input.setPrefix("Min MB: ")
@@ -219,7 +338,7 @@ class MainWindow(QMainWindow):
 
         # --- Scan Options ---
         self.quick_scan_radio = QRadioButton("Quick Scan (fast, less accurate)")
-        self.quick_scan_radio.setToolTip("Hashes only the first 4KB of each file. Fast but may have false positives.")
+        self.quick_scan_radio.setToolTip("Hashes only the first 64KB of each file. Fast but may have false positives.")
         self.full_scan_radio = QRadioButton("Full Scan (accurate, default)")
         self.full_scan_radio.setToolTip("Hashes the entire file content. Most accurate but slower for large files.")
         self.full_scan_radio.setChecked(True)
@@ -241,6 +360,10 @@ class MainWindow(QMainWindow):
         self.exclude_hidden_checkbox = QCheckBox("Exclude hidden files and folders")
         self.exclude_hidden_checkbox.setToolTip("Skip files and folders that start with a dot (.)")
         self.exclude_hidden_checkbox.setChecked(True)
+        self.hash_cache_checkbox = QCheckBox("Remember file hashes between scans")
+        self.hash_cache_checkbox.setToolTip(
+            f"Cache digests of unchanged files in {DEFAULT_CACHE_PATH} so re-scans skip re-reading them")
+        self.hash_cache_checkbox.setChecked(False)
 
         scan_options_layout = QVBoxLayout()
         scan_options_layout.addWidget(QLabel("Scan Mode:"))
@@ -260,6 +383,7 @@ class MainWindow(QMainWindow):
         scan_options_layout.addWidget(QLabel("Exclude Directories (comma-separated):"))
         scan_options_layout.addWidget(self.exclude_dirs_input)
         scan_options_layout.addWidget(self.exclude_hidden_checkbox)
+        scan_options_layout.addWidget(self.hash_cache_checkbox)
 
         self.scan_options_group = QGroupBox("Scan Options")
         self.scan_options_group.setLayout(scan_options_layout)
@@ -385,7 +509,7 @@ class MainWindow(QMainWindow):
 
     def start_scan(self):
         self.logger_output.clear()
-        self.result_table.setRowCount(0)
+        self.result_model.set_duplicates({})
         self.delete_button.setVisible(False)
         self.export_json_button.setVisible(False)
         self.export_csv_button.setVisible(False)
@@ -407,6 +531,7 @@ class MainWindow(QMainWindow):
             "exclude_files": [p.strip() for p in self.exclude_files_input.text().split(',') if p.strip()],
             "exclude_dirs": [d.strip() for d in self.exclude_dirs_input.text().split(',') if d.strip()],
             "exclude_hidden": self.exclude_hidden_checkbox.isChecked(),
+            "hash_cache": DEFAULT_CACHE_PATH if self.hash_cache_checkbox.isChecked() else None,
         }
 
         self.thread = QThread()
@@ -445,25 +570,7 @@ class MainWindow(QMainWindow):
 
         total_space, savings = analyze_space_savings(self.duplicates)
 
-        self.result_table.setSortingEnabled(False)
-        group_id = 1
-        for (size, hash), paths in sorted(self.duplicates.items()):
-            for path in paths:
-                row = self.result_table.rowCount()
-                self.result_table.insertRow(row)
-                self.result_table.setItem(
-                    row, 0, SortableItem(str(group_id), group_id))
-                self.result_table.setItem(
-                    row, 1, SortableItem(format_bytes(size), size))
-                item = QTableWidgetItem(f"{hash[:8]}...{hash[-8:]}")
-                item.setToolTip(hash)
-                self.result_table.setItem(row, 2, item)
-                path_item = QTableWidgetItem(path)
-                path_item.setToolTip(str(size))
-                self.result_table.setItem(row, 3, path_item)
-            group_id += 1
-
-        self.result_table.setSortingEnabled(True)
+        self.show_results()
 
         self.logger.info("")
         self.logger.info("📊 Scan Summary:")
@@ -483,6 +590,13 @@ class MainWindow(QMainWindow):
         self.export_json_button.setVisible(bool(self.duplicates))
         self.export_csv_button.setVisible(bool(self.duplicates))
 
+    def show_results(self):
+        """Load ``self.duplicates`` into the table, keeping the current sort."""
+        self.result_model.set_duplicates(self.duplicates)
+        header = self.result_table.horizontalHeader()
+        self.result_proxy.sort(
+            header.sortIndicatorSection(), header.sortIndicatorOrder())
+
     def set_controls_enabled(self, enabled: bool):
         self.select_button.setEnabled(enabled)
         self.scan_button.setEnabled(enabled)
@@ -504,22 +618,6 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(value)
         self.progress_label.setText(message)
 
-    def apply_filter(self):
-        keyword = self.filter_input.text().lower()
-
-        for row in range(self.result_table.rowCount()):
-            path_item = self.result_table.item(row, 3)
-            size_item = self.result_table.item(row, 3)
-            if not path_item or not size_item:
-                continue
-
-            path = path_item.text().lower()
-
-            matches_keyword = keyword in path
-
-            self.result_table.setRowHidden(
-                row, not matches_keyword)
-
     def run_deletion_process(self):
         if self.interactive_radio.isChecked():
             self.confirm_selected_deletion()
@@ -567,11 +665,9 @@ class MainWindow(QMainWindow):
             self.logger.info("⏹️ Deletion cancelled by user.")
             return
 
-        paths_to_delete = []
-        for row in selected_rows:
-            path_item = self.result_table.item(row.row(), 3)
-            if path_item:
-                paths_to_delete.append(path_item.text())
+        paths_to_delete = [
+            self.result_model.paths[self.result_proxy.mapToSource(index).row()]
+            for index in selected_rows]
 
         if paths_to_delete:
             # Assuming not a dry-run since it's an interactive deletion
@@ -613,7 +709,7 @@ class MainWindow(QMainWindow):
     def run_demo(self):
         """Run the demo functionality in a separate thread."""
         self.logger_output.clear()
-        self.result_table.setRowCount(0)
+        self.result_model.set_duplicates({})
         self.delete_button.setVisible(False)
         self.export_json_button.setVisible(False)
         self.export_csv_button.setVisible(False)
@@ -663,25 +759,7 @@ class MainWindow(QMainWindow):
         self.duplicates = duplicates
         total_space, savings = analyze_space_savings(self.duplicates)
 
-        self.result_table.setSortingEnabled(False)
-        group_id = 1
-        for (size, hash), paths in sorted(self.duplicates.items()):
-            for path in paths:
-                row = self.result_table.rowCount()
-                self.result_table.insertRow(row)
-                self.result_table.setItem(
-                    row, 0, SortableItem(str(group_id), group_id))
-                self.result_table.setItem(
-                    row, 1, SortableItem(format_bytes(size), size))
-                item = QTableWidgetItem(f"{hash[:8]}...{hash[-8:]}")
-                item.setToolTip(hash)
-                self.result_table.setItem(row, 2, item)
-                path_item = QTableWidgetItem(path)
-                path_item.setToolTip(str(size))
-                self.result_table.setItem(row, 3, path_item)
-            group_id += 1
-
-        self.result_table.setSortingEnabled(True)
+        self.show_results()
 
         # Show export buttons for demo results
         self.export_json_button.setVisible(bool(self.duplicates))
@@ -689,6 +767,8 @@ class MainWindow(QMainWindow):
 
 
 def main():
+    # Required for the hashing process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -79,4 +79,12 @@ class TestAnalyzer:
         
         # Test very small decimal values
         assert format_bytes(1) == "1.0 bytes"
-        assert format_bytes(0.5) == "0.5 bytes" 
\ No newline at end of file
+        assert format_bytes(0.5) == "0.5 bytes"
+
+    def test_format_bytes_unit_boundaries(self):
+        """Test byte formatting just below and at each unit boundary."""
+        units = ['bytes', 'KB', 'MB', 'GB', 'TB', 'PB']
+        for exponent in range(1, len(units)):
+            assert format_bytes(1024 ** exponent - 1).endswith(units[exponent - 1])
+            assert format_bytes(1024 ** exponent) == f"1.0 {units[exponent]}"
+        assert format_bytes(1024 ** 6) == "1024.0 PB"
@@ -101,4 +101,52 @@ def test_cli_boolean_flags():
         assert args.dry_run is True
         assert args.force is True
         assert args.interactive is True
-        assert args.exclude_hidden is True 
\ No newline at end of file
+        assert args.exclude_hidden is True 
+
+def test_cli_bufsize():
+    with patch.object(sys, "argv", ["prog"]):
+        assert parse_args().bufsize == 64 * 1024
+    with patch.object(sys, "argv", ["prog", "--bufsize", "4096"]):
+        assert parse_args().bufsize == 4096
+    for value in ("0", "-1", "many"):
+        with patch.object(sys, "argv", ["prog", "--bufsize", value]):
+            with pytest.raises(SystemExit):
+                parse_args()
+
+
+def test_cli_hash_algorithm():
+    with patch.object(sys, "argv", ["prog"]):
+        assert parse_args().hash == "auto"
+    with patch.object(sys, "argv", ["prog", "--hash", "xxh3"]):
+        assert parse_args().hash == "xxh3"
+
+
+def test_cli_hash_cache():
+    from duplicatemaster.hashcache import DEFAULT_CACHE_PATH
+    with patch.object(sys, "argv", ["prog"]):
+        assert parse_args().hash_cache is None
+    with patch.object(sys, "argv", ["prog", "--hash-cache"]):
+        assert parse_args().hash_cache == DEFAULT_CACHE_PATH
+    with patch.object(sys, "argv", ["prog", "--hash-cache", "/tmp/h.db", "."]):
+        assert parse_args().hash_cache == "/tmp/h.db"
+
+
+def test_cli_hash_parallelism():
+    with patch.object(sys, "argv", ["prog"]):
+        assert parse_args().hash_parallelism == "auto"
+    with patch.object(sys, "argv", ["prog", "--hash-parallelism", "processes"]):
+        assert parse_args().hash_parallelism == "processes"
+    with patch.object(sys, "argv", ["prog", "--hash-parallelism", "fibers"]):
+        with pytest.raises(SystemExit):
+            parse_args()
+
+
+def test_cli_parser_is_reused():
+    from duplicatemaster.cli import _build_parser
+    with patch.object(sys, "argv", ["prog", "--quick"]):
+        first = parse_args()
+    with patch.object(sys, "argv", ["prog"]):
+        second = parse_args()
+    assert first.quick is True and second.quick is False
+    assert second.exclude == []
+    assert _build_parser() is _build_parser()
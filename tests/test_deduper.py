@@ -3,6 +3,7 @@ import os
 from unittest.mock import patch, MagicMock, call
 from collections import defaultdict
 from duplicatemaster.deduper import find_duplicates
+from duplicatemaster.hasher import blake2bsum, resolve_hash_algorithms, AUTO_HASH_ALGORITHM
 
 
 class MockLogger:
@@ -22,6 +23,13 @@ class MockLogger:
         self.messages.append(("error", msg))
 
 
+def fake_hash_batch(hashes):
+    """Stand-in for the hasher's per-task worker that looks digests up in a dict."""
+    def run(paths, buffer_size, multi_region, algorithm="blake2b", sizes=None, cache_path=None):
+        return [(p, hashes[p], None) if p in hashes else (p, None, "missing") for p in paths]
+    return run
+
+
 class MockProgressCallback:
     def __init__(self):
         self.calls = []
@@ -31,7 +39,7 @@ class MockProgressCallback:
 
 
 @patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
+@patch('duplicatemaster.hasher._hash_batch')
 def test_find_duplicates_quick_mode(mock_hash_files, mock_get_files):
     """Test duplicate detection in quick mode."""
     # Mock file discovery with size information
@@ -42,11 +50,11 @@ def test_find_duplicates_quick_mode(mock_hash_files, mock_get_files):
     ]
 
     # Mock hashing results
-    mock_hash_files.return_value = {
+    mock_hash_files.side_effect = fake_hash_batch({
         "/path/file1.txt": "hash1",
         "/path/file2.txt": "hash1",  # Same hash as file1
         "/path/file3.txt": "hash2"
-    }
+    })
 
     logger = MockLogger()
     result = find_duplicates(
@@ -68,56 +76,56 @@ def test_find_duplicates_quick_mode(mock_hash_files, mock_get_files):
     assert result == expected
 
 
-@patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
-@patch('duplicatemaster.deduper.batch_hash_files')
-def test_find_duplicates_full_mode(mock_batch_hash, mock_hash_files, mock_get_files):
+def test_find_duplicates_full_mode(tmp_path):
     """Test duplicate detection in full mode."""
-    # Mock file discovery with size information
-    mock_get_files.return_value = [
-        (1024, "/path/file1.txt"),
-        (1024, "/path/file2.txt"),
-        (2048, "/path/file3.txt")
-    ]
+    from duplicatemaster import deduper, hasher
+    pair = os.urandom(100 * 1024)
+    (tmp_path / "pair1.bin").write_bytes(pair)
+    (tmp_path / "pair2.bin").write_bytes(pair)
+    # Same head, middle and tail regions; only a full read tells trio3 apart
+    trio = bytearray(os.urandom(80 * 1024))
+    (tmp_path / "trio1.bin").write_bytes(trio)
+    (tmp_path / "trio2.bin").write_bytes(trio)
+    trio[20000] ^= 0xFF
+    (tmp_path / "trio3.bin").write_bytes(trio)
+    (tmp_path / "unique.bin").write_bytes(os.urandom(40 * 1024))
+
+    with patch.object(hasher, "_hash_batch", wraps=hasher._hash_batch) as first_pass, \
+            patch.object(deduper, "batch_compare_files", wraps=deduper.batch_compare_files) as compare, \
+            patch.object(deduper, "batch_hash_files", wraps=deduper.batch_hash_files) as full_hash:
+        result = find_duplicates(
+            base_dir=str(tmp_path),
+            min_size=100,
+            max_size=1024 * 1024,
+            quick_mode=False,
+            multi_region=True,
+            exclude=[],
+            exclude_dir=[],
+            exclude_hidden=False,
+            threads=4,
+            logger=MockLogger(),
+            use_optimized_scanning=True
+        )
 
-    # Mock first hashing pass (quick scan)
-    mock_hash_files.return_value = {
-        "/path/file1.txt": "hash1",
-        "/path/file2.txt": "hash1",  # Same hash as file1
-        "/path/file3.txt": "hash2"
-    }
+    def names(paths):
+        return sorted(os.path.basename(p) for p in paths)
 
-    # Mock second hashing pass (full scan)
-    mock_batch_hash.return_value = {
-        "/path/file1.txt": "full_hash1",
-        "/path/file2.txt": "full_hash1",  # Same full hash
-    }
+    # Only the three-file size is hashed in the first pass; the pair and the unique size are not
+    first_pass_paths = [p for c in first_pass.call_args_list if c.args[1] == "auto" for p in c.args[0]]
+    assert names(first_pass_paths) == ["trio1.bin", "trio2.bin", "trio3.bin"]
+    # The pair is compared byte by byte, the group of three is hashed whole
+    assert [names(group) for group in compare.call_args.args[0]] == [["pair1.bin", "pair2.bin"]]
+    assert names(full_hash.call_args.args[0]) == ["trio1.bin", "trio2.bin", "trio3.bin"]
 
-    logger = MockLogger()
-    result = find_duplicates(
-        base_dir="/test",
-        min_size=100,
-        max_size=5000,
-        quick_mode=False,
-        multi_region=True,
-        exclude=[],
-        exclude_dir=[],
-        exclude_hidden=False,
-        threads=4,
-        logger=logger,
-        use_optimized_scanning=True
-    )
-
-    # Check results
-    expected = {(1024, "full_hash1"): ["/path/file1.txt", "/path/file2.txt"]}
-    assert result == expected
-
-    # Check that batch_hash_files was called for full scan verification
-    assert mock_batch_hash.call_count == 1
+    assert sorted(names(paths) for paths in result.values()) == [["pair1.bin", "pair2.bin"], ["trio1.bin", "trio2.bin"]]
+    full_algorithm = resolve_hash_algorithms(AUTO_HASH_ALGORITHM)[1]
+    for (size, digest), paths in result.items():
+        assert size == os.path.getsize(paths[0])
+        assert digest == blake2bsum(paths[0], -1, False, full_algorithm)
 
 
 @patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
+@patch('duplicatemaster.hasher._hash_batch')
 def test_find_duplicates_with_progress_callback(mock_hash_files, mock_get_files):
     """Test duplicate detection with progress callback."""
     # Mock file discovery with size information
@@ -127,10 +135,10 @@ def test_find_duplicates_with_progress_callback(mock_hash_files, mock_get_files)
     ]
 
     # Mock hashing results
-    mock_hash_files.return_value = {
+    mock_hash_files.side_effect = fake_hash_batch({
         "/path/file1.txt": "hash1",
         "/path/file2.txt": "hash1"
-    }
+    })
 
     logger = MockLogger()
     progress_callback = MockProgressCallback()
@@ -160,7 +168,7 @@ def test_find_duplicates_with_progress_callback(mock_hash_files, mock_get_files)
 
 
 @patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
+@patch('duplicatemaster.hasher._hash_batch')
 def test_find_duplicates_file_size_filtering(mock_hash_files, mock_get_files):
     """Test file size filtering."""
     # Mock file discovery with size information (only medium file in range)
@@ -169,9 +177,9 @@ def test_find_duplicates_file_size_filtering(mock_hash_files, mock_get_files):
     ]
 
     # Mock hashing results
-    mock_hash_files.return_value = {
+    mock_hash_files.side_effect = fake_hash_batch({
         "/path/medium.txt": "hash1"
-    }
+    })
 
     logger = MockLogger()
     result = find_duplicates(
@@ -191,12 +199,12 @@ def test_find_duplicates_file_size_filtering(mock_hash_files, mock_get_files):
     # Only medium.txt should be processed, but since it's alone, no duplicates
     assert result == {}
 
-    # Check that hash_files_with_size_info was called
-    mock_hash_files.assert_called_once()
+    # A file with a unique size is never hashed
+    mock_hash_files.assert_not_called()
 
 
 @patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
+@patch('duplicatemaster.hasher._hash_batch')
 def test_find_duplicates_os_error_handling(mock_hash_files, mock_get_files):
     """Test handling of OSError when getting file size."""
     # Mock file discovery with size information (only valid files)
@@ -206,10 +214,10 @@ def test_find_duplicates_os_error_handling(mock_hash_files, mock_get_files):
     ]
 
     # Mock hashing results
-    mock_hash_files.return_value = {
+    mock_hash_files.side_effect = fake_hash_batch({
         "/path/file1.txt": "hash1",
         "/path/file3.txt": "hash2"
-    }
+    })
 
     logger = MockLogger()
     result = find_duplicates(
@@ -226,22 +234,22 @@ def test_find_duplicates_os_error_handling(mock_hash_files, mock_get_files):
         use_optimized_scanning=True
     )
 
-    # Should process the valid files, but since they have different hashes, no duplicates
+    # Should process the valid files, but since they have different sizes, no duplicates
     assert result == {}
 
-    # Check that hash_files_with_size_info was called
-    mock_hash_files.assert_called_once()
+    # Files with unique sizes are never hashed
+    mock_hash_files.assert_not_called()
 
 
 @patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
+@patch('duplicatemaster.hasher._hash_batch')
 def test_find_duplicates_empty_directory(mock_hash_files, mock_get_files):
     """Test with empty directory."""
     # Mock empty file discovery
     mock_get_files.return_value = []
 
     # Mock hashing results for empty list
-    mock_hash_files.return_value = {}
+    mock_hash_files.side_effect = fake_hash_batch({})
 
     logger = MockLogger()
     result = find_duplicates(
@@ -269,46 +277,43 @@ def test_find_duplicates_empty_directory(mock_hash_files, mock_get_files):
 @patch('duplicatemaster.deduper.batch_hash_files')
 def test_find_duplicates_legacy_mode(mock_batch_hash, mock_get_files):
     """Test duplicate detection in legacy mode (non-optimized)."""
-    # Mock file discovery
+    # Mock file discovery (sizes come from the scanner)
     mock_get_files.return_value = [
-        "/path/file1.txt",
-        "/path/file2.txt",
-        "/path/file3.txt"
+        (1024, "/path/file1.txt"),
+        (1024, "/path/file2.txt"),
+        (2048, "/path/file3.txt")
     ]
 
-    # Mock file sizes
-    with patch('os.path.getsize') as mock_getsize:
-        mock_getsize.side_effect = [1024, 1024, 2048]
-
-        # Mock hashing results
-        mock_batch_hash.return_value = {
-            "/path/file1.txt": "hash1",
-            "/path/file2.txt": "hash1",  # Same hash as file1
-            "/path/file3.txt": "hash2"
-        }
+    # Mock hashing results
+    mock_batch_hash.return_value = {
+        "/path/file1.txt": "hash1",
+        "/path/file2.txt": "hash1",  # Same hash as file1
+        "/path/file3.txt": "hash2"
+    }
 
-        logger = MockLogger()
-        result = find_duplicates(
-            base_dir="/test",
-            min_size=100,
-            max_size=5000,
-            quick_mode=True,
-            multi_region=False,
-            exclude=[],
-            exclude_dir=[],
-            exclude_hidden=False,
-            threads=4,
-            logger=logger,
-            use_optimized_scanning=False
-        )
+    logger = MockLogger()
+    result = find_duplicates(
+        base_dir="/test",
+        min_size=100,
+        max_size=5000,
+        quick_mode=True,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=4,
+        logger=logger,
+        use_optimized_scanning=False
+    )
 
     # Check results
     expected = {(1024, "hash1"): ["/path/file1.txt", "/path/file2.txt"]}
     assert result == expected
+    assert mock_get_files.call_args.kwargs["yield_size"] is True
 
 
 @patch('duplicatemaster.deduper.get_files_with_size_filter')
-@patch('duplicatemaster.deduper.hash_files_with_size_info')
+@patch('duplicatemaster.hasher._hash_batch')
 def test_find_duplicates_no_duplicates_found(mock_hash_files, mock_get_files):
     """Test when no duplicates are found."""
     # Mock file discovery with size information
@@ -318,10 +323,10 @@ def test_find_duplicates_no_duplicates_found(mock_hash_files, mock_get_files):
     ]
 
     # Mock hashing results (different hashes)
-    mock_hash_files.return_value = {
+    mock_hash_files.side_effect = fake_hash_batch({
         "/path/file1.txt": "hash1",
         "/path/file2.txt": "hash2"
-    }
+    })
 
     logger = MockLogger()
     result = find_duplicates(
@@ -339,4 +344,264 @@ def test_find_duplicates_no_duplicates_found(mock_hash_files, mock_get_files):
     )
 
     # Should return empty dict when no duplicates found
-    assert result == {} 
\ No newline at end of file
+    assert result == {} 
+
+@patch('duplicatemaster.deduper.get_files_with_size_filter')
+@patch('duplicatemaster.hasher._hash_batch')
+def test_find_duplicates_skips_unique_sizes(mock_hash_files, mock_get_files):
+    """Only files sharing their size with another file are hashed."""
+    mock_get_files.return_value = [
+        (1024, "/path/file1.txt"),
+        (1024, "/path/file2.txt"),
+        (2048, "/path/file3.txt"),
+        (4096, "/path/file4.txt")
+    ]
+    mock_hash_files.side_effect = fake_hash_batch({
+        "/path/file1.txt": "hash1",
+        "/path/file2.txt": "hash1"
+    })
+
+    result = find_duplicates(
+        base_dir="/test",
+        min_size=100,
+        max_size=5000,
+        quick_mode=True,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=4,
+        logger=MockLogger(),
+        use_optimized_scanning=True
+    )
+
+    hashed = [path for c in mock_hash_files.call_args_list for path in c[0][0]]
+    assert sorted(hashed) == ["/path/file1.txt", "/path/file2.txt"]
+    assert result == {(1024, "hash1"): ["/path/file1.txt", "/path/file2.txt"]}
+
+
+def test_find_duplicates_full_mode_compares_pairs(tmp_path):
+    """Pairs are verified byte by byte; a difference past the prefix is caught."""
+    data = os.urandom(200 * 1024)
+    (tmp_path / "a.bin").write_bytes(data)
+    (tmp_path / "b.bin").write_bytes(data)
+    (tmp_path / "c.bin").write_bytes(data + b"0")
+    (tmp_path / "d.bin").write_bytes(data + b"1")
+    result = find_duplicates(
+        base_dir=str(tmp_path),
+        min_size=0,
+        max_size=1024 * 1024,
+        quick_mode=False,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=2,
+        logger=MockLogger(),
+        use_optimized_scanning=True
+    )
+    assert len(result) == 1
+    assert sorted(os.path.basename(p) for p in next(iter(result.values()))) == ["a.bin", "b.bin"]
+
+
+@patch('duplicatemaster.deduper.get_files_with_size_filter')
+@patch('duplicatemaster.hasher._hash_batch')
+@patch('duplicatemaster.deduper.batch_hash_files')
+def test_find_duplicates_full_mode_skips_fully_hashed(mock_batch_hash, mock_hash_files, mock_get_files):
+    """Files small enough to be hashed whole in the first pass are not read again."""
+    mock_get_files.return_value = [
+        (1024, "/path/file1.txt"),
+        (1024, "/path/file2.txt"),
+        (1024, "/path/file3.txt")
+    ]
+    mock_hash_files.side_effect = fake_hash_batch({
+        "/path/file1.txt": "hash1",
+        "/path/file2.txt": "hash1",
+        "/path/file3.txt": "hash1"
+    })
+    mock_batch_hash.return_value = {}
+
+    result = find_duplicates(
+        base_dir="/test",
+        min_size=100,
+        max_size=5000,
+        quick_mode=False,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=4,
+        logger=MockLogger(),
+        use_optimized_scanning=True
+    )
+
+    assert result == {(1024, "hash1"): ["/path/file1.txt", "/path/file2.txt", "/path/file3.txt"]}
+    assert mock_batch_hash.call_args[0][0] == []
+
+
+@patch('duplicatemaster.deduper.get_files_with_size_filter')
+@patch('duplicatemaster.hasher._hash_batch')
+@patch('duplicatemaster.deduper.batch_hash_files')
+def test_find_duplicates_full_verification_uses_processes(mock_batch_hash, mock_hash_files, mock_get_files):
+    """Full-file verification of larger groups may use the process pool."""
+    paths = [f"/path/file{i}.txt" for i in range(3)]
+    mock_get_files.return_value = [(204800, p) for p in paths]
+    mock_hash_files.side_effect = fake_hash_batch({p: "hash1" for p in paths})
+    mock_batch_hash.return_value = {p: "full_hash1" for p in paths}
+
+    result = find_duplicates(
+        base_dir="/test",
+        min_size=100,
+        max_size=500000,
+        quick_mode=False,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=4,
+        logger=MockLogger(),
+        use_optimized_scanning=True
+    )
+
+    assert result == {(204800, "full_hash1"): paths}
+    assert mock_batch_hash.call_args.kwargs["use_processes"] is True
+
+
+@patch('duplicatemaster.hasher._hash_batch')
+def test_find_duplicates_full_mode_pairs_skip_first_pass(mock_hash_files, tmp_path):
+    """A size shared by exactly two files is verified without a prefix hash."""
+    data = os.urandom(200 * 1024)
+    (tmp_path / "a.bin").write_bytes(data)
+    (tmp_path / "b.bin").write_bytes(data)
+
+    result = find_duplicates(
+        base_dir=str(tmp_path),
+        min_size=0,
+        max_size=1024 * 1024,
+        quick_mode=False,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=2,
+        logger=MockLogger(),
+        use_optimized_scanning=True
+    )
+
+    mock_hash_files.assert_not_called()
+    assert sorted(os.path.basename(p) for p in next(iter(result.values()))) == ["a.bin", "b.bin"]
+
+
+@pytest.mark.parametrize("quick_mode", [True, False])
+def test_find_duplicates_hardlinks_hashed_once(tmp_path, quick_mode):
+    """Hard links are reported with their copies but only one link per inode is read."""
+    data = os.urandom(200 * 1024)
+    (tmp_path / "a.bin").write_bytes(data)
+    os.link(tmp_path / "a.bin", tmp_path / "a_link.bin")
+    (tmp_path / "copy.bin").write_bytes(data)
+    (tmp_path / "solo.bin").write_bytes(os.urandom(1000))
+    os.link(tmp_path / "solo.bin", tmp_path / "solo_link.bin")
+    (tmp_path / "unique.bin").write_bytes(os.urandom(500))
+
+    from duplicatemaster import hasher
+    hashed = []
+    real_blake2bsum = hasher.blake2bsum
+
+    def counting_blake2bsum(path, *args, **kwargs):
+        hashed.append(os.path.basename(path))
+        return real_blake2bsum(path, *args, **kwargs)
+
+    with patch.object(hasher, "blake2bsum", side_effect=counting_blake2bsum):
+        result = find_duplicates(
+            base_dir=str(tmp_path),
+            min_size=0,
+            max_size=1024 * 1024,
+            quick_mode=quick_mode,
+            multi_region=False,
+            exclude=[],
+            exclude_dir=[],
+            exclude_hidden=False,
+            threads=2,
+            logger=MockLogger(),
+            use_optimized_scanning=True
+        )
+
+    groups = sorted(sorted(os.path.basename(p) for p in paths) for paths in result.values())
+    assert groups == [["a.bin", "a_link.bin", "copy.bin"], ["solo.bin", "solo_link.bin"]]
+    assert not {"a.bin", "a_link.bin"} <= set(hashed)
+    assert not {"solo.bin", "solo_link.bin"} <= set(hashed)
+
+
+def test_find_duplicates_full_mode_keys_use_one_algorithm(tmp_path):
+    """Groups confirmed by the first pass and verified groups carry digests of the same algorithm."""
+    small = os.urandom(1000)
+    for name in ("s1.bin", "s2.bin", "s3.bin"):
+        (tmp_path / name).write_bytes(small)
+    large = os.urandom(200 * 1024)
+    for name in ("l1.bin", "l2.bin", "l3.bin"):
+        (tmp_path / name).write_bytes(large)
+
+    result = find_duplicates(
+        base_dir=str(tmp_path),
+        min_size=0,
+        max_size=1024 * 1024,
+        quick_mode=False,
+        multi_region=False,
+        exclude=[],
+        exclude_dir=[],
+        exclude_hidden=False,
+        threads=2,
+        logger=MockLogger(),
+        use_optimized_scanning=True
+    )
+
+    full_algorithm = resolve_hash_algorithms(AUTO_HASH_ALGORITHM)[1]
+    assert len(result) == 2
+    for (size, digest), paths in result.items():
+        assert digest == blake2bsum(paths[0], -1, False, full_algorithm)
+
+
+@pytest.mark.parametrize("prefix_size", [0, -1, "auto"])
+def test_find_duplicates_rejects_invalid_prefix_size(tmp_path, prefix_size):
+    with pytest.raises(ValueError, match="prefix_size"):
+        find_duplicates(str(tmp_path), 0, 1024, True, False, [], [], False, 2, MockLogger(),
+                        prefix_size=prefix_size)
+
+
+def test_find_duplicates_full_mode_screens_regions(tmp_path, monkeypatch):
+    """Large files with matching prefixes but different tails are never hashed in full."""
+    from duplicatemaster import deduper, hasher
+    monkeypatch.setattr(deduper, "REGION_SCREEN_MIN_SIZE", 64 * 1024)
+    head = os.urandom(128 * 1024)
+    same = head + os.urandom(64 * 1024)
+    for name in ("a.bin", "b.bin", "c.bin"):
+        (tmp_path / name).write_bytes(same)
+    for name in ("x.bin", "y.bin"):
+        (tmp_path / name).write_bytes(head + os.urandom(64 * 1024))
+
+    full_hashed = []
+    real_blake2bsum = hasher.blake2bsum
+
+    def recording_blake2bsum(path, buffer_size, *args, **kwargs):
+        if buffer_size == -1:
+            full_hashed.append(os.path.basename(path))
+        return real_blake2bsum(path, buffer_size, *args, **kwargs)
+
+    with patch.object(hasher, "blake2bsum", side_effect=recording_blake2bsum):
+        result = find_duplicates(
+            base_dir=str(tmp_path),
+            min_size=0,
+            max_size=1024 * 1024,
+            quick_mode=False,
+            multi_region=False,
+            exclude=[],
+            exclude_dir=[],
+            exclude_hidden=False,
+            threads=2,
+            logger=MockLogger(),
+            use_optimized_scanning=True
+        )
+
+    assert [sorted(os.path.basename(p) for p in paths) for paths in result.values()] == [
+        ["a.bin", "b.bin", "c.bin"]]
+    assert sorted(full_hashed) == ["a.bin", "b.bin", "c.bin"]
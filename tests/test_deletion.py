@@ -304,4 +304,20 @@ def test_handle_deletion_single_file_groups(tmp_path):
     assert file2.exists()
     
     # Should not log any deletion messages (no duplicates to delete)
-    assert len(logger.info_messages) == 0 
\ No newline at end of file
+    assert len(logger.info_messages) == 0 
+
+def test_handle_deletion_force_deletes_all_groups(tmp_path):
+    """Non-interactive deletion removes every group's extra copies in one batch."""
+    paths = []
+    for i in range(6):
+        f = tmp_path / f"file{i}.txt"
+        f.write_text("same")
+        paths.append(str(f))
+    duplicates = {(4, "hash1"): paths[:3], (4, "hash2"): paths[3:]}
+    logger: Any = MockLogger()
+
+    handle_deletion(duplicates, MockArgs(force=True), logger)
+
+    assert [os.path.exists(p) for p in paths] == [True, False, False, True, False, False]
+    assert logger.info_messages == [f"Deleted: {p}" for p in paths[1:3] + paths[4:]]
+    assert logger.error_messages == []
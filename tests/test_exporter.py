@@ -202,4 +202,67 @@ def test_export_results_csv_error_handling(tmp_path):
     
     # Should log an error
     assert len(logger.error_messages) == 1
-    assert "CSV export failed" in logger.error_messages[0] 
\ No newline at end of file
+    assert "CSV export failed" in logger.error_messages[0] 
+
+def test_export_results_missing_json_attribute(tmp_path):
+    """Test CSV export with an args object that has no json_out attribute."""
+    csv_file = tmp_path / "test.csv"
+    args = type('Args', (), {'csv_out': str(csv_file)})()
+    logger = MockLogger()
+
+    export_results({(10, "hash1"): ["/a", "/b"]}, args, logger)
+
+    assert csv_file.read_text().splitlines() == [
+        "size_bytes,hash,path", "10,hash1,/a", "10,hash1,/b"]
+    assert len(logger.error_messages) == 0
+
+
+def test_export_results_json_surrogate_path(tmp_path):
+    """Test that undecodable file names are exported as JSON escapes."""
+    json_file = tmp_path / "test.json"
+    odd = os.fsdecode(b"/data/caf\xe9.txt")
+    duplicates = {(10, "aa"): ["/a", "/b"], (20, "bb"): [odd, "/c"]}
+    logger = MockLogger()
+
+    export_results(duplicates, MockArgs(json_out=str(json_file)), logger)
+
+    assert logger.error_messages == []
+    data = json.loads(json_file.read_text(encoding="utf-8"))
+    assert data[1]["paths"] == [odd, "/c"]
+
+
+def test_export_results_failed_json_leaves_no_file(tmp_path, monkeypatch):
+    """Test that a JSON export failing midway removes its partial file."""
+    import duplicatemaster.exporter as exporter
+    json_file = tmp_path / "test.json"
+    calls = []
+
+    def failing_dump(record):
+        calls.append(record)
+        if len(calls) > 1:
+            raise ValueError("cannot serialize")
+        return json.dumps(record)
+
+    monkeypatch.setattr(exporter, "_dump_record", failing_dump)
+    logger = MockLogger()
+    export_results({(10, "aa"): ["/a", "/b"], (20, "bb"): ["/c", "/d"]},
+                   MockArgs(json_out=str(json_file)), logger)
+
+    assert len(logger.error_messages) == 1
+    assert not json_file.exists()
+
+
+def test_export_results_json_error_keeps_csv(tmp_path):
+    """Test that a failing JSON target does not stop the CSV export."""
+    json_file = tmp_path / "test.json"
+    json_file.mkdir()
+    csv_file = tmp_path / "test.csv"
+    args = MockArgs(json_out=str(json_file), csv_out=str(csv_file))
+    logger = MockLogger()
+
+    export_results({(10, "hash1"): ["/a", "/b"]}, args, logger)
+
+    assert len(logger.error_messages) == 1
+    assert "JSON export failed" in logger.error_messages[0]
+    assert any("Written to CSV" in msg for msg in logger.info_messages)
+    assert csv_file.read_text().count("hash1") == 2
@@ -0,0 +1,121 @@
+import os
+import time
+from unittest.mock import patch
+
+from duplicatemaster import hasher
+from duplicatemaster.hashcache import HashCache
+from duplicatemaster.hasher import batch_compare_files, batch_hash_files, blake2bsum
+
+
+def make_old_file(path, content):
+    """Write a file and backdate its mtime so its digest may be cached."""
+    path.write_bytes(content)
+    old = time.time_ns() - 3600 * 10**9
+    os.utime(path, ns=(old, old))
+    return str(path)
+
+
+def test_hash_cache_roundtrip(tmp_path):
+    f = make_old_file(tmp_path / "a.bin", b"data")
+    db = str(tmp_path / "cache" / "hashes.db")
+    with HashCache(db) as cache:
+        key = cache.key(os.stat(f), "blake2b:full")
+        assert cache.get(key) is None
+        cache.put_many([(key, "abc")])
+        assert cache.get(key) == "abc"
+    with HashCache(db) as cache:
+        assert cache.get(key) == "abc"
+        assert cache.get(key[:-1] + ("blake3:full",)) is None
+
+
+def test_hash_cache_skips_recently_modified(tmp_path):
+    recent = tmp_path / "new.bin"
+    recent.write_bytes(b"data")
+    old = make_old_file(tmp_path / "old.bin", b"data")
+    assert not HashCache.is_stable(os.stat(recent))
+    assert HashCache.is_stable(os.stat(old))
+
+
+def test_batch_hash_files_uses_cache(tmp_path):
+    files = [make_old_file(tmp_path / f"f{i}.bin", bytes([i]) * 1000) for i in range(3)]
+    db = str(tmp_path / "hashes.db")
+    first = batch_hash_files(files, -1, False, 2, use_processes=False, cache_path=db)
+    assert first == {f: blake2bsum(f, -1, False) for f in files}
+
+    with patch.object(hasher, "blake2bsum", side_effect=AssertionError("re-hashed")):
+        assert batch_hash_files(files, -1, False, 2, use_processes=False, cache_path=db) == first
+        # A quick pass that covers these small files whole reuses the same entries
+        assert batch_hash_files(files, "auto", False, 2, use_processes=False, cache_path=db) == first
+
+
+def test_batch_hash_files_cache_misses_modified_file(tmp_path):
+    f = make_old_file(tmp_path / "f.bin", b"one")
+    db = str(tmp_path / "hashes.db")
+    before = batch_hash_files([f], -1, False, 1, use_processes=False, cache_path=db)[f]
+    make_old_file(tmp_path / "f.bin", b"two")
+    os.utime(f, ns=(time.time_ns() - 7200 * 10**9,) * 2)
+    after = batch_hash_files([f], -1, False, 1, use_processes=False, cache_path=db)[f]
+    assert before != after
+    assert after == blake2bsum(f, -1, False)
+
+
+def test_batch_compare_files_uses_cache(tmp_path):
+    pair = [make_old_file(tmp_path / f"p{i}.bin", b"same" * 100) for i in range(2)]
+    db = str(tmp_path / "hashes.db")
+    first = batch_compare_files([pair], 2, cache_path=db)
+    assert first == {p: blake2bsum(p, -1, False) for p in pair}
+
+    with patch.object(hasher, "files_equal", side_effect=AssertionError("re-read")):
+        assert batch_compare_files([pair], 2, cache_path=db) == first
+
+
+def test_batch_hash_files_reuses_cache_per_worker(tmp_path):
+    files = [make_old_file(tmp_path / f"f{i}.bin", bytes([i]) * 1000) for i in range(8)]
+    db = str(tmp_path / "hashes.db")
+    opened = []
+
+    class CountingCache(HashCache):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    with patch.object(hasher, "HashCache", CountingCache):
+        batch_hash_files(files, -1, False, 2, batch_size=1, use_processes=False, cache_path=db)
+    # One connection per worker thread, not per task, all closed with the pool
+    assert 1 <= len(opened) <= 2
+    assert not hasher._worker_caches
+
+
+def test_hash_cache_evicts_least_recently_used(tmp_path):
+    db = str(tmp_path / "hashes.db")
+    keys = [(0, i, 1, 0, "blake2b:full") for i in range(3)]
+    with HashCache(db, max_entries=2) as cache:
+        cache.put_many([(keys[0], "a")])
+        cache.put_many([(keys[1], "b")])
+        assert cache.get(keys[0]) == "a"
+        cache.put_many([(keys[2], "c")])
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) == "a"
+        assert cache.get(keys[2]) == "c"
+
+
+def test_hash_cache_flush_records_hits(tmp_path):
+    key = (0, 1, 1, 0, "blake2b:full")
+    with HashCache(str(tmp_path / "hashes.db")) as cache:
+        cache.put_many([(key, "a")])
+        stored = cache.connection.execute("SELECT used FROM hashes").fetchone()[0]
+        assert cache.get(key) == "a"
+        cache.flush()
+        assert cache.connection.execute("SELECT used FROM hashes").fetchone()[0] > stored
+
+
+def test_hash_cache_counts_rows_only_near_the_limit(tmp_path):
+    statements = []
+    with HashCache(str(tmp_path / "hashes.db"), max_entries=5) as cache:
+        cache.connection.set_trace_callback(statements.append)
+        for i in range(5):
+            cache.put_many([((0, i, 1, 0, "blake2b:full"), "x")])
+        assert sum("count(*)" in s for s in statements) == 1
+        cache.put_many([((0, 5, 1, 0, "blake2b:full"), "x")])
+        assert sum("count(*)" in s for s in statements) == 2
+        assert cache.connection.execute("SELECT count(*) FROM hashes").fetchone()[0] == 5
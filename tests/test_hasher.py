@@ -1,7 +1,10 @@
 import os
 import pytest
 import hashlib
-from duplicatemaster.hasher import blake2bsum, batch_hash_files, DEFAULT_THREADS
+from duplicatemaster.hasher import (
+    blake2bsum, batch_hash_files, covers_whole_file, files_equal, hash_files_pipelined, is_rotational, sort_by_inode,
+    DEFAULT_THREADS
+)
 
 
 def test_blake2bsum_basic(tmp_path):
@@ -9,7 +12,7 @@ def test_blake2bsum_basic(tmp_path):
     file.write_text("hello world")
     h = blake2bsum(str(file), buffer_size=-1, multi_region=False)
     assert isinstance(h, str)
-    assert len(h) == 128  # blake2b hex digest length
+    assert len(h) == 32  # 128-bit hex digest
 
 
 def test_blake2bsum_nonexistent():
@@ -28,4 +31,289 @@ def test_batch_hash_files(tmp_path):
     assert set(hashes.keys()) == set(files)
     for v in hashes.values():
         assert isinstance(v, str)
-        assert len(v) == 128 
\ No newline at end of file
+        assert len(v) == 32 
+
+def test_batch_hash_files_skips_unreadable(tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_text("data")
+    missing = str(tmp_path / "missing.txt")
+    hashes = batch_hash_files([str(good), missing], buffer_size=-1, multi_region=False,
+                              threads=2, batch_size=2)
+    assert set(hashes.keys()) == {str(good)}
+
+
+@pytest.mark.parametrize("size", [300 * 1024, 1024 * 1024, 1024 * 1024 + 1])
+def test_blake2bsum_full_matches_hashlib(tmp_path, size):
+    # Up to 1MB the file is read in one call, above it hashed from a memory mapping
+    data = os.urandom(size)
+    file = tmp_path / "big.bin"
+    file.write_bytes(data)
+    expected = hashlib.blake2b(data, digest_size=16).hexdigest()
+    assert blake2bsum(str(file), buffer_size=-1, multi_region=False) == expected
+
+
+def test_blake2bsum_unknown_algorithm(tmp_path):
+    file = tmp_path / "file.txt"
+    file.write_text("data")
+    with pytest.raises(ValueError):
+        blake2bsum(str(file), buffer_size=-1, multi_region=False, algorithm="md4")
+
+
+@pytest.mark.parametrize("module,algorithm", [("blake3", "blake3"), ("xxhash", "xxh3")])
+def test_alternative_algorithms(tmp_path, module, algorithm):
+    pytest.importorskip(module)
+    data = os.urandom(2 * 1024 * 1024)
+    files = []
+    for name in ("a.bin", "b.bin"):
+        file = tmp_path / name
+        file.write_bytes(data)
+        files.append(str(file))
+    result = batch_hash_files(files, -1, False, 2, algorithm=algorithm)
+    assert result[files[0]] == result[files[1]]
+    assert result[files[0]] != blake2bsum(files[0], buffer_size=-1, multi_region=False)
+    # Chunked reads must agree with the whole-file fast path
+    assert blake2bsum(files[0], 4096, False, algorithm) != result[files[0]]
+    assert blake2bsum(str(tmp_path / "a.bin"), 8 * 1024 * 1024, False, algorithm) == result[files[0]]
+
+
+def test_files_equal(tmp_path):
+    data = os.urandom(600 * 1024)
+    a, b, c = tmp_path / "a.bin", tmp_path / "b.bin", tmp_path / "c.bin"
+    a.write_bytes(data)
+    b.write_bytes(data)
+    c.write_bytes(data[:-1] + bytes([data[-1] ^ 0xFF]))
+    assert files_equal([str(a), str(b)]) == blake2bsum(str(a), buffer_size=-1, multi_region=False)
+    assert files_equal([str(a), str(c)]) is None
+    with pytest.raises(OSError):
+        files_equal([str(a), str(tmp_path / "missing.bin")])
+
+
+def test_hash_files_pipelined(tmp_path):
+    files = []
+    for name, content in [("a", b"same"), ("b", b"same"), ("c", b"diff"), ("d", b"unique!")]:
+        file = tmp_path / name
+        file.write_bytes(content)
+        files.append((len(content), str(file)))
+    scanned = []
+
+    groups, results = hash_files_pipelined(
+        iter(files), -1, False, 2, scan_callback=scanned.append
+    )
+
+    assert scanned == [4]
+    # Only sizes shared by several files are returned
+    assert [sorted(p) for p in groups.values()] == [sorted(str(tmp_path / n) for n in "abc")]
+    # The file with a unique size is never hashed
+    assert str(tmp_path / "d") not in results
+    assert results[str(tmp_path / "a")] == results[str(tmp_path / "b")]
+    assert results[str(tmp_path / "a")] != results[str(tmp_path / "c")]
+
+
+def test_hash_files_pipelined_propagates_scan_errors():
+    def failing_scan():
+        yield (1, "/nonexistent/a")
+        raise RuntimeError("scan failed")
+
+    with pytest.raises(RuntimeError, match="scan failed"):
+        hash_files_pipelined(failing_scan(), -1, False, 2)
+
+
+def test_sort_by_inode(tmp_path):
+    paths = []
+    for i in range(5):
+        file = tmp_path / f"f{i}.txt"
+        file.write_text(str(i))
+        paths.append(str(file))
+    missing = str(tmp_path / "missing.txt")
+    ordered = sort_by_inode([missing] + paths[::-1])
+    assert ordered[:-1] == sorted(paths, key=lambda p: os.stat(p).st_ino)
+    assert ordered[-1] == missing
+
+
+def test_hash_files_pipelined_uses_scanned_inodes(tmp_path, monkeypatch):
+    files = []
+    for name in "abc":
+        file = tmp_path / name
+        file.write_bytes(b"same")
+        st = os.stat(file)
+        files.append((4, str(file), (st.st_dev, st.st_ino)))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stat called")
+
+    monkeypatch.setattr(os, "stat", fail)
+    inodes = {}
+    groups, results = hash_files_pipelined(iter(files), -1, False, 2, inodes=inodes)
+    assert len(set(results.values())) == 1 and len(results) == 3
+    assert inodes == {path: inode for _, path, inode in files}
+
+
+def test_hash_files_pipelined_parallelism(tmp_path, monkeypatch):
+    import duplicatemaster.hasher as hasher
+    files = []
+    for name in "ab":
+        file = tmp_path / name
+        file.write_bytes(b"same")
+        files.append((4, str(file)))
+    pools = []
+    real_make_executor = hasher._make_executor
+
+    def recording_make_executor(*args):
+        executor = real_make_executor(*args)
+        pools.append(type(executor).__name__)
+        return executor
+
+    monkeypatch.setattr(hasher, "_make_executor", recording_make_executor)
+    for parallelism in ("auto", "processes"):
+        groups, results = hash_files_pipelined(iter(files), -1, False, 2, parallelism=parallelism)
+        assert len(results) == 2 and len(set(results.values())) == 1
+    assert pools == ["ThreadPoolExecutor", "ProcessPoolExecutor"]
+
+
+def test_sort_by_inode_uses_known_inodes():
+    inodes = {"/nonexistent/a": (1, 30), "/nonexistent/b": (1, 10), "/nonexistent/c": (0, 20)}
+    assert sort_by_inode(list(inodes), inodes) == ["/nonexistent/c", "/nonexistent/b", "/nonexistent/a"]
+
+
+def test_is_rotational_unknown_path():
+    assert is_rotational("/nonexistent/path") is False
+
+
+def test_covers_whole_file():
+    assert covers_whole_file(4096, "auto", False)
+    assert covers_whole_file(4096, "auto", True)
+    assert not covers_whole_file(100 * 1024, "auto", False)
+    assert covers_whole_file(64 * 1024, 64 * 1024, False)
+    assert not covers_whole_file(64 * 1024, 64 * 1024, True)
+    assert not covers_whole_file(64 * 1024 + 1, 64 * 1024, False)
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="posix_fadvise not available")
+def test_blake2bsum_fadvise(tmp_path, monkeypatch):
+    import duplicatemaster.hasher as hasher
+    calls = []
+    monkeypatch.setattr(hasher, "DONTNEED_THRESHOLD", 1024)
+    monkeypatch.setattr(os, "posix_fadvise", lambda fd, offset, length, advice: calls.append(advice))
+    file = tmp_path / "file.bin"
+    file.write_bytes(os.urandom(4096))
+    blake2bsum(str(file), buffer_size=-1, multi_region=False)
+    assert calls == [os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_DONTNEED]
+
+
+def test_blake2bsum_mmap_slices(tmp_path, monkeypatch):
+    import mmap
+    import duplicatemaster.hasher as hasher
+    monkeypatch.setattr(hasher, "MMAP_SLICE_THRESHOLD", 1024 * 1024)
+    monkeypatch.setattr(hasher, "MMAP_SLICE_SIZE", mmap.ALLOCATIONGRANULARITY * 64)
+    data = os.urandom(3 * 1024 * 1024 + 123)
+    file = tmp_path / "big.bin"
+    file.write_bytes(data)
+    expected = hashlib.blake2b(data, digest_size=16).hexdigest()
+    assert blake2bsum(str(file), buffer_size=-1, multi_region=False) == expected
+
+
+def test_blake2bsum_uses_known_size(tmp_path, monkeypatch):
+    file = tmp_path / "file.txt"
+    file.write_text("known size")
+    expected = blake2bsum(str(file), buffer_size=-1, multi_region=False)
+
+    def fail(path):
+        raise AssertionError("size should not be looked up")
+
+    monkeypatch.setattr(os.path, "getsize", fail)
+    assert blake2bsum(str(file), -1, False, file_size=file.stat().st_size) == expected
+
+
+def test_resolve_hash_algorithms(monkeypatch):
+    import duplicatemaster.hasher as hasher
+    from duplicatemaster.hasher import resolve_hash_algorithms
+    assert resolve_hash_algorithms("xxh3") == ("xxh3", "xxh3")
+    monkeypatch.setattr(hasher, "is_hash_algorithm_available", lambda name: True)
+    assert resolve_hash_algorithms("auto") == ("blake2b", "blake3")
+    monkeypatch.setattr(hasher, "is_hash_algorithm_available", lambda name: False)
+    assert resolve_hash_algorithms("auto") == ("blake2b", "blake2b")
+
+
+def test_sodium_blake2b_matches_hashlib():
+    pytest.importorskip("nacl")
+    from duplicatemaster.hasher import _SodiumBlake2b
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    h = _SodiumBlake2b()
+    h.update(data[:100])
+    h.update(memoryview(data)[100:])
+    assert h.hexdigest() == hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def test_blake2bsum_multi_region(tmp_path, monkeypatch):
+    data = os.urandom(100 * 1024)
+    file = tmp_path / "file.bin"
+    file.write_bytes(data)
+    size = len(data)
+    regions = data[:4096] + data[size // 2 - 2048:size // 2 + 2048] + data[-4096:]
+    expected = hashlib.blake2b(regions, digest_size=16).hexdigest()
+    assert blake2bsum(str(file), 4096, multi_region=True) == expected
+    # Fallback for platforms without os.pread
+    monkeypatch.delattr(os, "pread")
+    assert blake2bsum(str(file), 4096, multi_region=True) == expected
+
+
+def test_blake2bsum_prefix(tmp_path, monkeypatch):
+    data = os.urandom(100 * 1024)
+    file = tmp_path / "file.bin"
+    file.write_bytes(data)
+    expected = hashlib.blake2b(data[:4096], digest_size=16).hexdigest()
+    assert blake2bsum(str(file), 4096, multi_region=False) == expected
+    monkeypatch.delattr(os, "pread")
+    assert blake2bsum(str(file), 4096, multi_region=False) == expected
+
+
+def test_batch_hash_files_no_progress_bar_without_tty(tmp_path, monkeypatch):
+    """tqdm is skipped entirely when stderr is not a terminal."""
+    from duplicatemaster import hasher
+    f = tmp_path / "a.txt"
+    f.write_text("data")
+    monkeypatch.setattr(hasher, "_show_progress_bar", lambda: False)
+    monkeypatch.setattr(hasher, "tqdm", lambda *a, **k: pytest.fail("tqdm created"))
+    assert batch_hash_files([str(f)], -1, False, 1) == {str(f): blake2bsum(str(f), -1, False)}
+
+
+def test_make_executor_does_not_fork():
+    from duplicatemaster.hasher import _make_executor
+    with _make_executor(1, 2, True, "processes") as executor:
+        assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+
+
+def test_make_executor_parallelism():
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from duplicatemaster.hasher import _make_executor, PROCESS_POOL_MIN_FILES
+    cases = [
+        (PROCESS_POOL_MIN_FILES, True, "auto", ProcessPoolExecutor),
+        (1, True, "auto", ThreadPoolExecutor),
+        (1, True, "processes", ProcessPoolExecutor),
+        (PROCESS_POOL_MIN_FILES, True, "threads", ThreadPoolExecutor),
+        (PROCESS_POOL_MIN_FILES, False, "processes", ThreadPoolExecutor),
+    ]
+    for num_files, use_processes, parallelism, expected in cases:
+        with _make_executor(num_files, 2, use_processes, parallelism) as executor:
+            assert isinstance(executor, expected)
+    with pytest.raises(ValueError):
+        _make_executor(1, 2, True, "fibers")
+
+
+def test_batch_hash_files_hashes_each_inode_once(tmp_path, monkeypatch):
+    from duplicatemaster import hasher
+    a = tmp_path / "a.bin"
+    a.write_bytes(b"linked")
+    os.link(a, tmp_path / "b.bin")
+    c = tmp_path / "c.bin"
+    c.write_bytes(b"other")
+    paths = [str(a), str(tmp_path / "b.bin"), str(c), str(c)]
+
+    hashed = []
+    real_blake2bsum = hasher.blake2bsum
+    monkeypatch.setattr(hasher, "blake2bsum",
+                        lambda path, *args: hashed.append(path) or real_blake2bsum(path, *args))
+    result = batch_hash_files(paths, -1, False, 2, use_processes=False, inode_order=True)
+
+    assert sorted(hashed) == [str(a), str(c)]
+    assert result == {p: real_blake2bsum(p, -1, False) for p in paths}
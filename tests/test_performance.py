@@ -127,9 +127,9 @@ class TestOptimizedHasher:
             large_hash = blake2bsum(str(large_file), "auto", False)
             
             # All hashes should be valid
-            assert len(small_hash) == 128
-            assert len(medium_hash) == 128
-            assert len(large_hash) == 128
+            assert len(small_hash) == 32
+            assert len(medium_hash) == 32
+            assert len(large_hash) == 32
 
     def test_memory_mapping(self):
         """Test memory mapping functionality for large files."""
@@ -145,7 +145,7 @@ class TestOptimizedHasher:
             
             # Both methods should produce the same hash
             assert hash1 == hash2
-            assert len(hash1) == 128
+            assert len(hash1) == 32
 
     def test_hash_files_with_size_info(self):
         """Test optimized hashing with pre-computed size information."""
@@ -166,7 +166,7 @@ class TestOptimizedHasher:
             # All files should be hashed
             assert len(results) == 5
             for path in results.values():
-                assert len(path) == 128
+                assert len(path) == 32
 
     def test_batch_hashing_optimizations(self):
         """Test batch hashing optimizations."""
@@ -186,6 +186,23 @@ class TestOptimizedHasher:
             assert results1 == results2
             assert len(results1) == 10
 
+    def test_process_pool_matches_thread_pool(self, monkeypatch):
+        """Test that the process pool produces the same hashes as threads."""
+        import duplicatemaster.hasher as hasher
+        monkeypatch.setattr(hasher, "PROCESS_POOL_MIN_FILES", 1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for i in range(8):
+                file_path = Path(temp_dir) / f"file{i}.txt"
+                file_path.write_text(f"content {i}")
+                paths.append(str(file_path))
+
+            threaded = batch_hash_files(paths, -1, False, 2, use_processes=False)
+            processed = batch_hash_files(paths, -1, False, 2, use_processes=True)
+
+            assert threaded == processed
+            assert len(processed) == 8
+
 
 class TestPerformanceBenchmark:
     """Test cases for performance benchmarking."""
@@ -208,6 +225,18 @@ class TestPerformanceBenchmark:
             assert stats['total_files'] == 15
             assert stats['subdirectories'] == 5
 
+    def test_test_data_hardlinked_duplicates(self):
+        """Hard-linked duplicates are still reported as duplicate groups."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            benchmark = PerformanceBenchmark()
+            stats = benchmark.create_test_data(Path(temp_dir), num_files=4, num_duplicates=2,
+                                               hardlink_duplicates=True)
+            assert stats['total_files'] == 6
+
+            result = benchmark.benchmark_scan(str(temp_dir), "Links", threads=2, quick_mode=False)
+            assert result['duplicates_found'] == 2
+            assert result['total_duplicate_files'] == 4
+
     def test_single_benchmark(self):
         """Test single benchmark execution."""
         with tempfile.TemporaryDirectory() as temp_dir:
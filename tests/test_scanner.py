@@ -1,6 +1,6 @@
 import pytest
 import os
-from duplicatemaster.scanner import get_files_recursively
+from duplicatemaster.scanner import get_files_recursively, get_files_with_size_filter
 
 class DummyLogger:
     def debug(self, msg): pass
@@ -47,4 +47,89 @@ def test_get_files_recursively_exclude_dir(tmp_path):
     result = list(get_files_recursively(str(tmp_path), [], ["skipdir"], False, DummyLogger()))
     found = [os.path.relpath(f, tmp_path) for f in result]
     assert "skipdir/b.txt" not in found
-    assert "a.txt" in found and "keepdir/c.txt" in found 
\ No newline at end of file
+    assert "a.txt" in found and "keepdir/c.txt" in found 
+
+def test_get_files_sequential_skips_symlinks(tmp_path):
+    create_files(tmp_path, ["real.txt", "sub/inner.txt"])
+    os.symlink(tmp_path / "real.txt", tmp_path / "link.txt")
+    os.symlink(tmp_path / "sub", tmp_path / "linkdir")
+    result = list(get_files_recursively(str(tmp_path), [], [], False, DummyLogger(), max_workers=1))
+    found = sorted(os.path.relpath(f, tmp_path) for f in result)
+    assert found == ["real.txt", os.path.join("sub", "inner.txt")]
+
+
+def test_get_files_with_size_filter_single_worker(tmp_path):
+    create_files(tmp_path, ["a.txt", "sub/b.txt"])
+    (tmp_path / "big.txt").write_text("x" * 100)
+    result = sorted(get_files_with_size_filter(str(tmp_path), [], [], False, 1, 10, DummyLogger(), max_workers=1))
+    assert result == [(4, str(tmp_path / "a.txt")), (4, str(tmp_path / "sub" / "b.txt"))]
+
+
+def test_get_files_recursively_yield_size(tmp_path):
+    create_files(tmp_path, ["a.txt", "sub/b.txt"])
+    for workers in (1, 2):
+        result = sorted(get_files_recursively(str(tmp_path), [], [], False, DummyLogger(),
+                                              max_workers=workers, yield_size=True))
+        assert result == [(4, str(tmp_path / "a.txt")), (4, str(tmp_path / "sub" / "b.txt"))]
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_exclude_multiple_patterns(tmp_path, max_workers):
+    create_files(tmp_path, ["a.txt", "b.log", "c.tmp", "sub/d.bak", "sub/e.txt", "f.log.txt"])
+    result = get_files_recursively(str(tmp_path), ["*.log", "*.tmp", "?.bak"], [], False,
+                                   DummyLogger(), max_workers=max_workers)
+    found = sorted(os.path.basename(f) for f in result)
+    assert found == ["a.txt", "e.txt", "f.log.txt"]
+    sized = get_files_with_size_filter(str(tmp_path), ["*.log", "*.tmp", "?.bak"], [], False,
+                                       0, 100, DummyLogger(), max_workers=max_workers)
+    assert sorted(os.path.basename(p) for _, p in sized) == found
+
+
+
+def test_scandir_fallback_walks_nested_tree(tmp_path):
+    from duplicatemaster.scanner import _scandir_files
+    create_files(tmp_path, ["a.txt", "x/b.txt", "x/y/c.txt", "x/y/z/d.txt", "w/e.txt"])
+    deep = tmp_path.joinpath(*["n"] * 50)
+    deep.mkdir(parents=True)
+    (deep / "leaf.txt").write_text("test")
+    expected = sorted(get_files_recursively(str(tmp_path), [], [], False, DummyLogger(), max_workers=4))
+    assert len(expected) == 6
+    assert sorted(_scandir_files(str(tmp_path), None, frozenset(), False, DummyLogger())) == expected
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_files_with_size_filter_collapses_hardlinks(tmp_path, max_workers):
+    create_files(tmp_path, ["a.txt", "sub/b.txt"])
+    os.link(tmp_path / "a.txt", tmp_path / "sub" / "a_link.txt")
+    hardlinks = {}
+    result = list(get_files_with_size_filter(str(tmp_path), [], [], False, 0, 100, DummyLogger(),
+                                             max_workers=max_workers, hardlinks=hardlinks))
+    assert len(result) == 2
+    [(first, aliases)] = hardlinks.items()
+    assert sorted([first] + aliases) == [str(tmp_path / "a.txt"), str(tmp_path / "sub" / "a_link.txt")]
+    assert (4, first) in result
+    # Without a hardlinks dict every path is yielded
+    assert len(list(get_files_with_size_filter(str(tmp_path), [], [], False, 0, 100, DummyLogger(),
+                                               max_workers=max_workers))) == 3
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_files_with_size_filter_with_inode(tmp_path, max_workers):
+    create_files(tmp_path, ["a.txt", "sub/b.txt"])
+    result = list(get_files_with_size_filter(str(tmp_path), [], [], False, 0, 100, DummyLogger(),
+                                             max_workers=max_workers, with_inode=True))
+    assert len(result) == 2
+    for size, path, inode in result:
+        st = os.stat(path)
+        assert (size, inode) == (st.st_size, (st.st_dev, st.st_ino))
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_scanner_skips_debug_messages_when_disabled(tmp_path, max_workers):
+    import logging
+    create_files(tmp_path, ["a.txt", "b.log", "sub/c.txt"])
+    logger = logging.getLogger("test_scanner_quiet")
+    logger.setLevel(logging.INFO)
+    logger.debug = lambda *a, **k: pytest.fail("debug message built")
+    result = list(get_files_with_size_filter(str(tmp_path), ["*.log"], [], False, 0, 100,
+                                             logger, max_workers=max_workers))
+    assert sorted(os.path.basename(p) for _, p in result) == ["a.txt", "c.txt"]